@@ -0,0 +1,118 @@
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections, transaction
+from django.urls import Resolver404, resolve
+from rest_framework import status
+
+FORWARDED_META = (
+    'SERVER_NAME', 'SERVER_PORT', 'SERVER_PROTOCOL', 'REMOTE_ADDR',
+    'HTTP_HOST', 'HTTP_ACCEPT_LANGUAGE', 'HTTP_X_FORWARDED_FOR',
+    'wsgi.url_scheme', 'wsgi.version', 'wsgi.errors',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def error(code, detail):
+    return {'status': code, 'body': {'detail': detail}}
+
+
+def sub_request(request, item):
+    path, _, query = item['path'].partition('?')
+    body = b''
+    if item['method'] != 'GET':
+        body = json.dumps(item.get('body') or {}).encode()
+    environ = {
+        key: request.META[key] for key in FORWARDED_META
+        if key in request.META
+    }
+    environ.update({
+        'REQUEST_METHOD': item['method'],
+        'PATH_INFO': path,
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+    })
+    sub = WSGIRequest(environ)
+    if request.user.is_authenticated:
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+    return sub
+
+
+def execute(request, item):
+    try:
+        with transaction.atomic():
+            return run(request, item)
+    except Exception:
+        logger.exception(
+            'Batch request %s %s failed', item['method'], item['path']
+        )
+        return error(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, 'Internal server error.'
+        )
+
+
+def run(request, item):
+    path = item['path'].partition('?')[0]
+    if (
+        not path.startswith(settings.API_URL_PREFIX)
+        or path == request.path
+    ):
+        return error(status.HTTP_400_BAD_REQUEST, 'Path is not batchable.')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return error(status.HTTP_404_NOT_FOUND, 'Not found.')
+    if not hasattr(match.func, 'cls'):
+        return error(status.HTTP_400_BAD_REQUEST, 'Path is not batchable.')
+    sub = sub_request(request, item)
+    sub.resolver_match = match
+    response = match.func(sub, *match.args, **match.kwargs)
+    return {'status': response.status_code, 'body': response_body(response)}
+
+
+def response_body(response):
+    if hasattr(response, 'data'):
+        return response.data
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(response.content)
+    return None
+
+
+def execute_in_thread(request, item):
+    try:
+        return execute(request, item)
+    finally:
+        connections.close_all()
+
+
+def execute_batch(request, items):
+    results = []
+    reads = []
+
+    def flush():
+        if len(reads) == 1:
+            results.append(execute(request, reads[0]))
+        elif reads:
+            with ThreadPoolExecutor(settings.BATCH_THREADS) as pool:
+                results.extend(pool.map(
+                    lambda item: execute_in_thread(request, item), reads
+                ))
+        reads.clear()
+
+    for item in items:
+        if item['method'] == 'GET':
+            reads.append(item)
+            continue
+        flush()
+        results.append(execute(request, item))
+    flush()
+    return results
@@ -0,0 +1,133 @@
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+CODING = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$')
+
+
+def encodings():
+    available = ['gzip']
+    if brotli is not None:
+        available.insert(0, 'br')
+    return available
+
+
+def negotiate(accept_encoding):
+    weights = {}
+    for item in accept_encoding.lower().split(','):
+        match = CODING.match(item)
+        if match:
+            coding, weight = match.groups()
+            try:
+                weights[coding] = float(weight) if weight else 1.0
+            except ValueError:
+                continue
+    best, best_weight = None, 0
+    for coding in encodings():
+        weight = weights.get(coding, weights.get('*', 0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class GzipStream:
+
+    def __init__(self, level):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliStream:
+
+    def __init__(self, quality):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+def compressor(coding, level=None):
+    if coding == 'br':
+        return BrotliStream(
+            settings.COMPRESSION_BROTLI_QUALITY if level is None else level
+        )
+    return GzipStream(
+        settings.COMPRESSION_GZIP_LEVEL if level is None else level
+    )
+
+
+def compress(coding, data, level=None):
+    stream = compressor(coding, level)
+    return stream.compress(data) + stream.finish()
+
+
+def compress_stream(coding, chunks):
+    stream = compressor(coding)
+    for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').lower()
+    return (
+        response.status_code == 200
+        and not response.has_header('Content-Encoding')
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+def weaken_etag(response):
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+
+
+def compress_response(request, response):
+    if not is_compressible(response):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if (not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE):
+        return response
+    coding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if coding is None:
+        return response
+    if response.streaming:
+        response.streaming_content = compress_stream(
+            coding, response.streaming_content
+        )
+        del response['Content-Length']
+    else:
+        content = compress(coding, response.content)
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+    weaken_etag(response)
+    response['Content-Encoding'] = coding
+    return response
@@ -0,0 +1,220 @@
+import json
+import queue
+import random
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+Event = namedtuple('Event', ('id', 'channel', 'event', 'data'))
+
+
+class Subscription:
+
+    def __init__(self, hub, channel):
+        self.hub = hub
+        self.channel = channel
+        self.events = queue.Queue(maxsize=settings.EVENTS_BUFFER_SIZE)
+        self.backlog = deque()
+        self.seen = deque(maxlen=settings.EVENTS_HISTORY_SIZE)
+        self.truncated = False
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def replay(self, events):
+        limit = settings.EVENTS_BUFFER_SIZE
+        self.backlog.extend(events[:limit])
+        if len(events) > limit:
+            self.truncated = self.overflowed = True
+
+    def accept(self, event):
+        if event.id in self.seen:
+            return False
+        self.seen.append(event.id)
+        return True
+
+    def get(self, timeout):
+        while self.backlog:
+            event = self.backlog.popleft()
+            if self.accept(event):
+                return event
+        while True:
+            event = self.events.get(timeout=timeout)
+            if self.accept(event):
+                return event
+
+    def drain(self):
+        while self.backlog:
+            event = self.backlog.popleft()
+            if self.accept(event):
+                yield event
+        while not self.truncated:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if self.accept(event):
+                yield event
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class Hub:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self.lock:
+            self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            channel = self.subscriptions[subscription.channel]
+            channel.discard(subscription)
+            if not channel:
+                del self.subscriptions[subscription.channel]
+
+    def dispatch(self, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(event.channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+
+class InMemoryBroker:
+
+    def __init__(self):
+        self.hub = Hub()
+        self.lock = threading.Lock()
+        self.last_id = 0
+        self.history = defaultdict(
+            lambda: deque(maxlen=settings.EVENTS_HISTORY_SIZE)
+        )
+
+    def publish(self, channel, event, data):
+        with self.lock:
+            self.last_id += 1
+            message = Event(self.last_id, channel, event, data)
+            self.history[channel].append(message)
+        self.hub.dispatch(message)
+
+    def replay(self, channel, last_event_id):
+        with self.lock:
+            return [
+                event for event in self.history.get(channel, ())
+                if event.id > last_event_id
+            ]
+
+    def subscribe(self, channel, last_event_id=None):
+        subscription = self.hub.subscribe(channel)
+        if last_event_id is not None:
+            subscription.replay(self.replay(channel, last_event_id))
+        return subscription
+
+
+class DatabaseBroker(InMemoryBroker):
+
+    def __init__(self):
+        super().__init__()
+        self.listener = None
+
+    def publish(self, channel, event, data):
+        from .models import StreamEvent
+
+        StreamEvent.objects.create(
+            channel=channel, event=event, data=json.dumps(data)
+        )
+        if random.random() < settings.EVENTS_CLEANUP_RATE:
+            StreamEvent.objects.filter(
+                created__lt=timezone.now() - timedelta(
+                    seconds=settings.EVENTS_RETENTION
+                )
+            ).delete()
+
+    def replay(self, channel, last_event_id):
+        from .models import StreamEvent
+
+        return [
+            Event(event.id, event.channel, event.event, json.loads(event.data))
+            for event in StreamEvent.objects.filter(
+                channel=channel, id__gt=last_event_id
+            ).order_by('id')[:settings.EVENTS_HISTORY_SIZE]
+        ]
+
+    def subscribe(self, channel, last_event_id=None):
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(
+                    target=self.listen, name='events-listener', daemon=True
+                )
+                self.listener.start()
+        return super().subscribe(channel, last_event_id)
+
+    def listen(self):
+        from .models import StreamEvent
+
+        last_id = StreamEvent.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0
+        lookback = timedelta(seconds=settings.EVENTS_POLL_LOOKBACK)
+        started = timezone.now()
+        dispatched = {}
+        while True:
+            time.sleep(settings.EVENTS_POLL_INTERVAL)
+            close_old_connections()
+            if not self.hub.subscriptions:
+                continue
+            since = max(timezone.now() - lookback, started)
+            for event in StreamEvent.objects.filter(
+                Q(id__gt=last_id) | Q(created__gte=since)
+            ).order_by('id'):
+                last_id = max(last_id, event.id)
+                if event.id in dispatched:
+                    continue
+                dispatched[event.id] = event.created
+                self.hub.dispatch(Event(
+                    event.id, event.channel, event.event,
+                    json.loads(event.data)
+                ))
+            dispatched = {
+                event_id: created for event_id, created in dispatched.items()
+                if created >= since
+            }
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
+
+
+def publish(channel, event, data):
+    transaction.on_commit(
+        lambda: get_broker().publish(channel, event, data)
+    )
+
+
+def title_channel(title_id):
+    return f'title-{title_id}'
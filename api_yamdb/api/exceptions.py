@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailedError(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The object version does not match If-Match.'
+    default_code = 'precondition_failed'
+
+
+class EditConflictError(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The object was changed by another request, try again.'
+    default_code = 'edit_conflict'
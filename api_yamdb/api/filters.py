@@ -1,12 +1,69 @@
-﻿import django_filters
-from reviews.models import Title
+import django_filters
+from django.db.models import Avg, Count
+from rest_framework import filters
+from reviews.catalog import get_snapshot
+from reviews.models import Category, Genre, GenreTitle, Review, Title
 
 
 class TitleFilter(django_filters.FilterSet):
+    ANY = 'any'
+    ALL = 'all'
+
     name = django_filters.CharFilter(lookup_expr='startswith')
-    category = django_filters.CharFilter(field_name='category__slug')
-    genre = django_filters.CharFilter(field_name='genre__slug')
+    category = django_filters.CharFilter(method='filter_category')
+    genre = django_filters.CharFilter(method='filter_genre')
+    genre_match = django_filters.ChoiceFilter(
+        choices=((ANY, ANY), (ALL, ALL)), method='filter_genre_match'
+    )
+    year_min = django_filters.NumberFilter(
+        field_name='year', lookup_expr='gte'
+    )
+    year_max = django_filters.NumberFilter(
+        field_name='year', lookup_expr='lte'
+    )
+    rating_min = django_filters.NumberFilter(method='filter_rating')
+    rating_max = django_filters.NumberFilter(method='filter_rating')
 
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+    def filter_category(self, queryset, name, value):
+        category = get_snapshot(Category).by_slug.get(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category_id=category.pk)
+
+    def filter_genre(self, queryset, name, value):
+        by_slug = get_snapshot(Genre).by_slug
+        slugs = {slug.strip() for slug in value.split(',') if slug.strip()}
+        ids = {by_slug[slug].pk for slug in slugs if slug in by_slug}
+        match_all = self.form.cleaned_data.get('genre_match') == self.ALL
+        if not ids or match_all and len(ids) < len(slugs):
+            return queryset.none()
+        links = GenreTitle.objects.filter(genre_id__in=ids).values('title_id')
+        if match_all and len(ids) > 1:
+            links = links.annotate(
+                matched=Count('genre_id', distinct=True)
+            ).filter(matched=len(ids)).values('title_id')
+        return queryset.filter(id__in=links)
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+    def filter_rating(self, queryset, name, value):
+        lookup = 'gte' if name == 'rating_min' else 'lte'
+        rated = Review.objects.values('title_id').annotate(
+            rating=Avg('score')
+        ).filter(**{f'rating__{lookup}': value}).values('title_id')
+        return queryset.filter(id__in=rated)
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        ordering = ordering or queryset.model._meta.ordering
+        if ordering and not {'pk', '-pk'} & set(ordering):
+            ordering = (*ordering, 'pk')
+        return ordering
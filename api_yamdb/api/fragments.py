@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from reviews.catalog import current_version
+from reviews.models import Comment, Review, Title
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+def splice(fragments):
+    return b'[' + b','.join(fragments) + b']'
+
+
+def fragment_key(generation, *parts):
+    return ':'.join(map(str, ('fragment', generation, *parts)))
+
+
+def title_key(pk, version, generation=None):
+    return fragment_key(generation or current_version(), 'title', pk, version)
+
+
+def review_key(pk, version, generation=None):
+    return fragment_key(
+        generation or current_version(), 'review', pk, version
+    )
+
+
+def comment_key(pk, generation=None):
+    return fragment_key(generation or current_version(), 'comment', pk)
+
+
+def forget(keys):
+    keys = list(keys)
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def forget_titles(ids):
+    generation = current_version()
+    forget(
+        title_key(pk, version, generation)
+        for pk, version in Title.objects.filter(pk__in=ids).values_list(
+            'pk', 'version'
+        )
+    )
+
+
+def forget_reviews(reviews):
+    generation = current_version()
+    forget(
+        review_key(pk, version, generation)
+        for pk, version in reviews.values_list('pk', 'version')
+    )
+
+
+def forget_author(user_id):
+    generation = current_version()
+    forget_reviews(Review.objects.filter(author_id=user_id))
+    forget(
+        comment_key(pk, generation) for pk in Comment.objects.filter(
+            author_id=user_id
+        ).values_list('pk', flat=True)
+    )
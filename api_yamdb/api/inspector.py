@@ -0,0 +1,100 @@
+import logging
+import os
+import re
+import traceback
+from collections import defaultdict
+
+from django import db
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LISTS = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+SPACES = re.compile(r'\s+')
+ORM_DIR = os.path.dirname(db.__file__) + os.sep
+MIDDLEWARE_FILE = os.path.join(os.path.dirname(__file__), 'middleware.py')
+
+
+class QueryBudgetError(Exception):
+    pass
+
+
+def normalize(sql):
+    sql = LITERALS.sub('?', sql)
+    sql = PLACEHOLDER_LISTS.sub('(...)', sql)
+    return SPACES.sub(' ', sql).strip()
+
+
+def query_stack():
+    stack = traceback.extract_stack()[:-2]
+    while stack and stack[-1].filename.startswith(ORM_DIR):
+        stack.pop()
+    return stack
+
+
+def app_frames(stack):
+    frames = [
+        frame for frame in stack
+        if frame.filename.startswith(settings.BASE_DIR)
+        and 'site-packages' not in frame.filename
+        and frame.filename not in (__file__, MIDDLEWARE_FILE)
+    ]
+    if stack and stack[-1] not in frames:
+        frames.append(stack[-1])
+    return frames
+
+
+class QueryInspector:
+
+    def __init__(self):
+        self.count = 0
+        self.patterns = defaultdict(list)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.patterns[normalize(sql)].append(query_stack())
+        return execute(sql, params, many, context)
+
+    def duplicates(self):
+        threshold = settings.QUERY_INSPECTOR_DUPLICATES
+        return {
+            sql: stacks for sql, stacks in self.patterns.items()
+            if len(stacks) >= threshold
+        }
+
+
+def view_budget(request):
+    match = request.resolver_match
+    view = getattr(match.func, 'cls', None) if match else None
+    budget = getattr(view, 'query_budget', None)
+    if isinstance(budget, dict):
+        actions = getattr(match.func, 'actions', None) or {}
+        return budget.get(actions.get(request.method.lower()))
+    return budget
+
+
+def call_site(stack):
+    if not stack:
+        return 'unknown call site'
+    frame = stack[-1]
+    return f'{frame.filename}:{frame.lineno} in {frame.name}'
+
+
+def report(request, inspector):
+    for sql, stacks in inspector.duplicates().items():
+        logger.warning(
+            '%s %s: %d similar queries from %s\n%s\n%s',
+            request.method, request.path, len(stacks), call_site(stacks[0]),
+            sql, ''.join(traceback.format_list(app_frames(stacks[0]))),
+        )
+    budget = view_budget(request)
+    if budget is None or inspector.count <= budget:
+        return
+    message = (
+        f'{request.method} {request.path} ran {inspector.count} queries, '
+        f'budget is {budget}'
+    )
+    logger.warning(message)
+    if settings.QUERY_INSPECTOR_RAISE:
+        raise QueryBudgetError(message)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.mail import send_mail
+from jobs.registry import job
+
+from .purge import get_backend
+
+
+@job(max_attempts=5)
+def send_confirmation_code(email, confirmation_code):
+    send_mail(
+        subject='Код подтверждения от YaMdb',
+        message=f'Your confirmation_code is {confirmation_code}',
+        from_email=settings.EMAIL_ADMIN,
+        recipient_list=[email],
+        fail_silently=False,
+    )
+
+
+@job(max_attempts=5)
+def purge_cache(keys):
+    get_backend().purge(keys)
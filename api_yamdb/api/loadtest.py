@@ -0,0 +1,280 @@
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.models import Review, Title, User, UserCode
+
+USER_PREFIX = 'loadtest_'
+DEFAULT_MIX = 'browse=60,comments=25,review=10,auth=5'
+UNLIMITED_RATE = '1000000/day'
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(LoadTest.SCENARIOS)
+    if unknown:
+        raise ValueError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+    return mix
+
+
+def start_server(port, workers):
+    env = dict(
+        THROTTLE_ANON=UNLIMITED_RATE,
+        THROTTLE_USER=UNLIMITED_RATE,
+        THROTTLE_CATALOG=UNLIMITED_RATE,
+        THROTTLE_AUTH=UNLIMITED_RATE,
+    )
+    executable = shutil.which('gunicorn')
+    if executable is None:
+        raise RuntimeError('gunicorn is not installed')
+    process = subprocess.Popen(
+        [
+            executable, 'api_yamdb.wsgi:application',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+        ],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, **env},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start in 30 seconds')
+
+
+def prepare(users):
+    authors = []
+    for number in range(users):
+        author, _ = User.objects.get_or_create(
+            username=f'{USER_PREFIX}{number}',
+            defaults={'email': f'{USER_PREFIX}{number}@loadtest.fake'},
+        )
+        authors.append(author)
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    reviewed = set(Review.objects.filter(author__in=authors).values_list(
+        'author_id', 'title_id'
+    ))
+    targets = [
+        (str(RefreshToken.for_user(author).access_token), title_id)
+        for author in authors for title_id in title_ids
+        if (author.id, title_id) not in reviewed
+    ]
+    random.shuffle(targets)
+    return {
+        'titles': title_ids,
+        'reviews': list(Review.objects.values_list('title_id', 'id')),
+        'targets': targets,
+    }
+
+
+def cleanup():
+    return User.objects.filter(username__startswith=USER_PREFIX).delete()
+
+
+def confirmation_code(username):
+    return UserCode.objects.get(
+        username__username=username
+    ).confirmation_code
+
+
+def percentile(values, share):
+    return values[max(math.ceil(share * len(values)) - 1, 0)]
+
+
+async def fetch(address, host, method, path, token=None, body=None):
+    reader, writer = await asyncio.open_connection(*address)
+    try:
+        headers = [f'{method} {path} HTTP/1.0', f'Host: {host}']
+        payload = b''
+        if token:
+            headers.append(f'Authorization: Bearer {token}')
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers.append('Content-Type: application/json')
+            headers.append(f'Content-Length: {len(payload)}')
+        writer.write('\r\n'.join(headers).encode() + b'\r\n\r\n' + payload)
+        raw = await reader.read()
+    finally:
+        writer.close()
+    head, _, content = raw.partition(b'\r\n\r\n')
+    return int(head.split(b' ', 2)[1]), content
+
+
+class LoadTest:
+    SCENARIOS = ('browse', 'comments', 'review', 'auth')
+
+    def __init__(self, address, host, data, mix, concurrency, duration,
+                 rate=None):
+        self.address = address
+        self.host = host
+        self.data = data
+        self.mix = mix
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rate = rate
+        self.results = defaultdict(list)
+
+    async def request(self, route, method, path, expected, **kwargs):
+        start = time.perf_counter()
+        try:
+            status, content = await fetch(
+                self.address, self.host, method, path, **kwargs
+            )
+        except (OSError, ValueError, IndexError):
+            status, content = None, b''
+        self.results[route].append(
+            (time.perf_counter() - start, status in expected)
+        )
+        return status, content
+
+    async def pace(self, loop):
+        if not self.rate:
+            return
+        now = loop.time()
+        slot = max(self.next_slot, now)
+        self.next_slot = slot + 1 / self.rate
+        await asyncio.sleep(slot - now)
+
+    async def browse(self):
+        pages = max(math.ceil(
+            len(self.data['titles']) / settings.REST_FRAMEWORK['PAGE_SIZE']
+        ), 1)
+        await self.request(
+            'titles-list', 'GET',
+            f'/api/v1/titles/?page={random.randint(1, pages)}', {200},
+        )
+        title_id = random.choice(self.data['titles'])
+        await self.request(
+            'titles-detail', 'GET', f'/api/v1/titles/{title_id}/', {200}
+        )
+
+    async def comments(self):
+        title_id, review_id = random.choice(self.data['reviews'])
+        await self.request(
+            'comments-list', 'GET',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            {200},
+        )
+
+    async def review(self):
+        if not self.data['targets']:
+            return await self.browse()
+        token, title_id = self.data['targets'].pop()
+        await self.request(
+            'reviews-create', 'POST', f'/api/v1/titles/{title_id}/reviews/',
+            {201}, token=token,
+            body={'text': 'Load test review', 'score': random.randint(1, 10)},
+        )
+
+    async def auth(self):
+        username = f'{USER_PREFIX}{uuid.uuid4().hex[:12]}'
+        status, _ = await self.request(
+            'auth-signup', 'POST', '/api/v1/auth/signup/', {200},
+            body={'username': username, 'email': f'{username}@loadtest.fake'},
+        )
+        if status != 200:
+            return
+        code = await asyncio.get_event_loop().run_in_executor(
+            None, confirmation_code, username
+        )
+        await self.request(
+            'auth-token', 'POST', '/api/v1/auth/token/', {200},
+            body={'username': username, 'confirmation_code': code},
+        )
+
+    async def worker(self, loop, deadline):
+        names, weights = zip(*self.mix.items())
+        while loop.time() < deadline:
+            await self.pace(loop)
+            await getattr(self, random.choices(names, weights)[0])()
+
+    async def run(self):
+        loop = asyncio.get_event_loop()
+        self.next_slot = loop.time()
+        deadline = loop.time() + self.duration
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            self.worker(loop, deadline) for _ in range(self.concurrency)
+        ))
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        routes = {}
+        for route, samples in sorted(self.results.items()):
+            latencies = sorted(latency * 1000 for latency, _ in samples)
+            errors = sum(1 for _, ok in samples if not ok)
+            routes[route] = {
+                'requests': len(samples),
+                'rps': len(samples) / elapsed,
+                'error_rate': errors / len(samples),
+                'p50': percentile(latencies, 0.5),
+                'p90': percentile(latencies, 0.9),
+                'p99': percentile(latencies, 0.99),
+                'max': latencies[-1],
+            }
+        total = sum(route['requests'] for route in routes.values())
+        return {
+            'elapsed': elapsed,
+            'concurrency': self.concurrency,
+            'rate': self.rate,
+            'mix': self.mix,
+            'requests': total,
+            'rps': total / elapsed,
+            'routes': routes,
+        }
+
+
+def format_report(report, baseline=None):
+    lines = [
+        f'{report["requests"]} requests in {report["elapsed"]:.1f} s, '
+        f'{report["rps"]:.1f} req/s at concurrency {report["concurrency"]}',
+        f'{"route":<16}{"req":>7}{"req/s":>9}{"err%":>7}'
+        f'{"p50":>9}{"p90":>9}{"p99":>9}{"max":>9}',
+    ]
+    for route, stats in report['routes'].items():
+        lines.append(
+            f'{route:<16}{stats["requests"]:>7}{stats["rps"]:>9.1f}'
+            f'{stats["error_rate"] * 100:>7.1f}{stats["p50"]:>9.1f}'
+            f'{stats["p90"]:>9.1f}{stats["p99"]:>9.1f}{stats["max"]:>9.1f}'
+        )
+        previous = (baseline or {}).get('routes', {}).get(route)
+        if previous:
+            lines.append(
+                f'{"  vs baseline":<16}{"":>7}'
+                f'{change(stats["rps"], previous["rps"]):>9}'
+                f'{delta(stats["error_rate"], previous["error_rate"]):>7}'
+                f'{change(stats["p50"], previous["p50"]):>9}'
+                f'{change(stats["p90"], previous["p90"]):>9}'
+                f'{change(stats["p99"], previous["p99"]):>9}'
+                f'{change(stats["max"], previous["max"]):>9}'
+            )
+    return '\n'.join(lines)
+
+
+def delta(current, previous):
+    return f'{(current - previous) * 100:+.1f}'
+
+
+def change(current, previous):
+    if not previous:
+        return '-'
+    return f'{(current - previous) / previous * 100:+.0f}%'
@@ -0,0 +1,92 @@
+import csv
+import itertools
+import os
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from api import compression
+
+GZIP_LEVELS = (1, 3, 5, 6, 9)
+BROTLI_QUALITIES = (1, 3, 4, 5, 7, 11)
+
+
+def review_rows():
+    path = os.path.join(settings.BASE_DIR, 'static', 'data', 'review.csv')
+    with open(path, encoding='utf-8') as source:
+        return list(csv.DictReader(source))
+
+
+def page(rows, size):
+    rows = itertools.islice(itertools.cycle(rows), size)
+    return JSONRenderer().render({
+        'count': 1000,
+        'next': 'http://localhost/api/v1/titles/1/reviews/?page=3',
+        'previous': 'http://localhost/api/v1/titles/1/reviews/?page=1',
+        'results': [
+            {
+                'id': number,
+                'text': row['text'],
+                'author': f'user{row["author_id"]}',
+                'score': int(row['score']),
+                'pub_date': row['pub_date'],
+            }
+            for number, row in enumerate(rows, 1)
+        ],
+    })
+
+
+def timed(run, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append((time.perf_counter() - start) * 1000000)
+    return result, statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = 'Compare compressed size and CPU time of API pages per level'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='4,20,100',
+            help='Comma-separated numbers of reviews per page',
+        )
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def settings_for(self, coding):
+        if coding == 'br':
+            return BROTLI_QUALITIES, settings.COMPRESSION_BROTLI_QUALITY
+        return GZIP_LEVELS, settings.COMPRESSION_GZIP_LEVEL
+
+    def handle(self, *args, **options):
+        rows = review_rows()
+        if compression.brotli is None:
+            self.stdout.write('Brotli is not installed, gzip only')
+        for size in map(int, options['sizes'].split(',')):
+            content = page(rows, size)
+            self.stdout.write(
+                f'\n{size} reviews, {len(content)} bytes, '
+                f'threshold {settings.COMPRESSION_MIN_SIZE} bytes'
+            )
+            self.stdout.write(
+                f'{"coding":<8}{"level":>6}{"bytes":>9}{"ratio":>8}'
+                f'{"µs":>9}{"MB/s":>8}'
+            )
+            for coding in compression.encodings():
+                levels, default = self.settings_for(coding)
+                for level in levels:
+                    compressed, duration = timed(
+                        lambda: compression.compress(coding, content, level),
+                        options['repeat'],
+                    )
+                    marker = ' *' if level == default else ''
+                    self.stdout.write(
+                        f'{coding:<8}{level:>6}{len(compressed):>9}'
+                        f'{len(compressed) / len(content):>8.2f}'
+                        f'{duration:>9.0f}{len(content) / duration:>8.1f}'
+                        f'{marker}'
+                    )
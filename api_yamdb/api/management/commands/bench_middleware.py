@@ -0,0 +1,86 @@
+import io
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import BaseCommand
+from django.test.utils import override_settings
+
+STARTUP_SCRIPT = (
+    'import time; start = time.perf_counter(); import api_yamdb.wsgi; '
+    'print(time.perf_counter() - start)'
+)
+
+
+def full_middleware():
+    middleware = []
+    for path in settings.MIDDLEWARE:
+        if path == 'api.middleware.BrowserMiddleware':
+            middleware.extend(settings.BROWSER_MIDDLEWARE)
+        else:
+            middleware.append(path)
+    return middleware
+
+
+def environ(path):
+    host = settings.ALLOWED_HOSTS[0]
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'HTTP_HOST': host,
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+    }
+
+
+def start_response(status, headers, exc_info=None):
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Measure middleware overhead and wsgi startup time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/unknown/')
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--startups', type=int, default=5)
+
+    def measure(self, middleware, path, count):
+        with override_settings(MIDDLEWARE=middleware):
+            handler = WSGIHandler()
+            handler(environ(path), start_response)
+            start = time.perf_counter()
+            for _ in range(count):
+                handler(environ(path), start_response)
+            return (time.perf_counter() - start) / count * 10 ** 6
+
+    def startup(self):
+        result = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=dict(os.environ, PYTHONPATH=settings.BASE_DIR),
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        return float(result.stdout) * 1000
+
+    def handle(self, *args, **options):
+        path, count = options['path'], options['requests']
+        full = self.measure(full_middleware(), path, count)
+        lean = self.measure(settings.MIDDLEWARE, path, count)
+        self.stdout.write(f'{path}: full chain {full:.1f} us/request')
+        self.stdout.write(f'{path}: API chain {lean:.1f} us/request')
+        self.stdout.write(f'saved {full - lean:.1f} us/request')
+        startups = [self.startup() for _ in range(options['startups'])]
+        self.stdout.write(
+            f'api_yamdb.wsgi import: median '
+            f'{statistics.median(startups):.0f} ms, '
+            f'min {min(startups):.0f} ms'
+        )
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import BaseCommand, CommandError
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+
+def address(number):
+    return f'10.0.{number // 250}.{number % 250}'
+
+
+class CatalogView(APIView):
+    throttle_scope = 'catalog'
+
+
+class Command(BaseCommand):
+    help = 'Measure rate limiting overhead per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--budget', type=float, default=100)
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        request = APIView().initialize_request(
+            APIRequestFactory().get('/api/v1/titles/')
+        )
+        request.user = AnonymousUser()
+        view = CatalogView()
+        throttles = [
+            throttle() for throttle in api_settings.DEFAULT_THROTTLE_CLASSES
+        ]
+        start = time.perf_counter()
+        for number in range(count):
+            request.META['REMOTE_ADDR'] = address(number)
+            for throttle in throttles:
+                throttle.allow_request(request, view)
+        overhead = (time.perf_counter() - start) / count * 10 ** 6
+        cache.delete_many([
+            f'throttle:{scope}:{address(number)}'
+            for scope in ('anon', 'catalog') for number in range(count)
+        ])
+        backend = settings.CACHES['default']['BACKEND']
+        self.stdout.write(
+            f'{backend}: {overhead:.1f} us/request '
+            f'for {len(throttles)} throttles'
+        )
+        if overhead > options['budget']:
+            raise CommandError(
+                f'throttling overhead exceeds {options["budget"]} us'
+            )
@@ -0,0 +1,108 @@
+import random
+import statistics
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from api.filters import TitleFilter
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+
+BATCH_SIZE = 500
+QUERIES = (
+    {'genre': 'drama'},
+    {'genre': 'drama,comedy,thriller'},
+    {'genre': 'drama,comedy,thriller', 'genre_match': 'all'},
+    {'year_min': '1990', 'year_max': '2000'},
+    {'rating_min': '7'},
+    {'genre': 'drama,comedy', 'genre_match': 'all', 'rating_min': '5'},
+)
+
+
+def populate(titles, genres_per_title, reviewers):
+    genres = list(Genre.objects.all())
+    categories = list(Category.objects.all())
+    authors = User.objects.bulk_create(
+        User(username=f'bench-{number}', email=f'bench-{number}@yamdb.fake')
+        for number in range(reviewers)
+    )
+    if not authors[0].pk:
+        authors = list(User.objects.filter(username__startswith='bench-'))
+    start = Title.objects.order_by('-id').values_list('id', flat=True)
+    start = (start.first() or 0) + 1
+    Title.objects.bulk_create((
+        Title(
+            id=start + number,
+            name=f'Bench title {number}',
+            year=random.randint(1900, 2022),
+            category=random.choice(categories),
+        )
+        for number in range(titles)
+    ), batch_size=BATCH_SIZE)
+    title_ids = range(start, start + titles)
+    GenreTitle.objects.bulk_create((
+        GenreTitle(genre=genre, title_id=title_id)
+        for title_id in title_ids
+        for genre in random.sample(genres, genres_per_title)
+    ), batch_size=BATCH_SIZE)
+    Review.objects.bulk_create((
+        Review(
+            title_id=title_id,
+            author=author,
+            text='bench',
+            score=random.randint(1, 10),
+        )
+        for title_id in title_ids
+        for author in authors
+    ), batch_size=BATCH_SIZE)
+
+
+def joined_all(queryset, slugs):
+    for slug in slugs.split(','):
+        queryset = queryset.filter(genre__slug=slug)
+    return queryset
+
+
+def timed(run, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark TitleFilter over a generated catalog (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=20000)
+        parser.add_argument('--genres-per-title', type=int, default=3)
+        parser.add_argument('--reviewers', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with transaction.atomic():
+            populate(
+                options['titles'],
+                options['genres_per_title'],
+                options['reviewers'],
+            )
+            for params in QUERIES:
+                count, duration = timed(lambda: TitleFilter(
+                    params, queryset=Title.objects.all()
+                ).qs.count(), repeat)
+                query = '&'.join(
+                    f'{key}={value}' for key, value in params.items()
+                )
+                self.stdout.write(
+                    f'{query}: {count} titles, {duration:.1f} ms'
+                )
+            count, duration = timed(lambda: joined_all(
+                Title.objects.all(), 'drama,comedy,thriller'
+            ).count(), repeat)
+            self.stdout.write(
+                f'repeated joins for all of three genres: {count} titles, '
+                f'{duration:.1f} ms'
+            )
+            transaction.set_rollback(True)
@@ -0,0 +1,71 @@
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def import_times(module):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings'},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if result.returncode:
+        raise CommandError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    times = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            times.append((name, len(indent) // 2, int(own), int(cumulative)))
+    return times
+
+
+class Command(BaseCommand):
+    help = 'Profile imports of the WSGI application against a time budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='api_yamdb.wsgi')
+        parser.add_argument(
+            '--budget', type=float, default=settings.STARTUP_IMPORT_BUDGET,
+            help='Allowed import time of the module in milliseconds',
+        )
+        parser.add_argument('--top', type=int, default=15)
+
+    def handle(self, *args, **options):
+        module = options['module']
+        times = import_times(module)
+        total = next(
+            (cumulative for name, depth, _, cumulative in times
+             if name == module and depth == 0),
+            None,
+        )
+        if total is None:
+            raise CommandError(f'{module} was already imported by Python')
+        packages = Counter()
+        for name, _, own, _ in times:
+            packages[name.partition('.')[0]] += own
+        self.stdout.write(f'{"package":<32}{"ms":>9}')
+        for package, own in packages.most_common(options['top']):
+            self.stdout.write(f'{package:<32}{own / 1000:>9.1f}')
+        self.stdout.write(f'\n{"module":<48}{"self ms":>9}')
+        for name, _, own, _ in sorted(
+            times, key=lambda item: item[2], reverse=True
+        )[:options['top']]:
+            self.stdout.write(f'{name:<48}{own / 1000:>9.1f}')
+        message = (
+            f'\nimport {module}: {total / 1000:.0f} ms, '
+            f'budget {options["budget"]:.0f} ms'
+        )
+        if total / 1000 > options['budget']:
+            raise CommandError(message.strip())
+        self.stdout.write(self.style.SUCCESS(message))
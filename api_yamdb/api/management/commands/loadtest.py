@@ -0,0 +1,75 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from api.loadtest import (
+    DEFAULT_MIX,
+    LoadTest,
+    cleanup,
+    format_report,
+    parse_mix,
+    prepare,
+    start_server,
+)
+
+
+class Command(BaseCommand):
+    help = 'Drive a mix of API routes under gunicorn and report latencies'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', help='Test a running server instead of starting one'
+        )
+        parser.add_argument('--port', type=int, default=8001)
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--duration', type=float, default=30)
+        parser.add_argument(
+            '--rate', type=float, help='Scenarios started per second'
+        )
+        parser.add_argument('--mix', default=DEFAULT_MIX)
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--save', help='Write the report as a baseline')
+        parser.add_argument('--baseline', help='Compare with a saved report')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as error:
+            raise CommandError(error)
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+        server = None
+        if options['url']:
+            url = urlsplit(options['url'])
+            address = (url.hostname, url.port or 80)
+        else:
+            address = ('127.0.0.1', options['port'])
+            try:
+                server = start_server(options['port'], options['workers'])
+            except RuntimeError as error:
+                raise CommandError(error)
+        try:
+            test = LoadTest(
+                address,
+                settings.ALLOWED_HOSTS[0],
+                prepare(options['users']),
+                mix,
+                options['concurrency'],
+                options['duration'],
+                options['rate'],
+            )
+            report = asyncio.get_event_loop().run_until_complete(test.run())
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+            cleanup()
+        self.stdout.write(format_report(report, baseline))
+        if options['save']:
+            with open(options['save'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
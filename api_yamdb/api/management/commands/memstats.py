@@ -0,0 +1,36 @@
+from django.core.management import BaseCommand
+from api.memory import MB, collect
+
+
+class Command(BaseCommand):
+    help = 'Show memory metrics published by web workers'
+
+    def handle(self, *args, **options):
+        workers, views = collect()
+        if not workers:
+            self.stdout.write(
+                'No data: set MEMORY_ACCOUNTING=1 and use a shared cache'
+            )
+            return
+        self.stdout.write(
+            f'{"worker":<40}{"req":>8}{"rss MB":>9}{"peak MB":>9}'
+            f'{"traced MB":>11}'
+        )
+        for summary in workers:
+            self.stdout.write(
+                f'{summary["worker"]:<40}{summary["requests"]:>8}'
+                f'{summary["rss"] / MB:>9.1f}{summary["rss_peak"] / MB:>9.1f}'
+                f'{summary["traced"] / MB:>11.1f}'
+            )
+        self.stdout.write(
+            f'\n{"view":<40}{"req":>8}{"rss KB":>9}{"max KB":>9}'
+            f'{"traced KB":>11}{"max KB":>9}'
+        )
+        for view in views:
+            self.stdout.write(
+                f'{view["view"]:<40}{view["requests"]:>8}'
+                f'{view["rss_mean"] / 1024:>9.1f}'
+                f'{view["rss_max"] / 1024:>9.1f}'
+                f'{view["traced_mean"] / 1024:>11.1f}'
+                f'{view["traced_max"] / 1024:>9.1f}'
+            )
@@ -0,0 +1,204 @@
+import logging
+import os
+import resource
+import signal
+import socket
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+WORKERS_KEY = 'memory:workers'
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+MB = 1024 * 1024
+
+
+def rss():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def traced():
+    if not tracemalloc.is_tracing():
+        return 0
+    return tracemalloc.get_traced_memory()[0]
+
+
+def worker_key(worker_id):
+    return f'memory:worker:{worker_id}'
+
+
+class ViewMemory:
+
+    def __init__(self):
+        self.requests = 0
+        self.rss = 0
+        self.rss_max = 0
+        self.traced = 0
+        self.traced_max = 0
+
+    def add(self, rss_delta, traced_delta):
+        self.requests += 1
+        self.rss += rss_delta
+        self.rss_max = max(self.rss_max, rss_delta)
+        self.traced += traced_delta
+        self.traced_max = max(self.traced_max, traced_delta)
+
+
+class MemoryAccounting:
+
+    def __init__(self):
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.started = time.time()
+        self.views = defaultdict(ViewMemory)
+        self.requests = 0
+        self.rss_peak = 0
+        self.baseline = None
+        self.recycling = False
+        if settings.MEMORY_TRACEMALLOC and not tracemalloc.is_tracing():
+            tracemalloc.start(settings.MEMORY_TRACEMALLOC_FRAMES)
+        if tracemalloc.is_tracing():
+            self.baseline = tracemalloc.take_snapshot()
+
+    def record(self, view, rss_before, traced_before):
+        current = rss()
+        self.requests += 1
+        self.rss_peak = max(self.rss_peak, current)
+        self.views[view].add(current - rss_before, traced() - traced_before)
+        if self.requests % settings.MEMORY_PUBLISH_EVERY == 1:
+            self.publish(current)
+        return current
+
+    def summary(self, current=None):
+        return {
+            'worker': self.worker_id,
+            'started': self.started,
+            'updated': time.time(),
+            'requests': self.requests,
+            'rss': current or rss(),
+            'rss_peak': self.rss_peak,
+            'traced': traced(),
+            'views': {view: vars(stats) for view, stats in self.views.items()},
+        }
+
+    def publish(self, current=None):
+        ttl = settings.MEMORY_SUMMARY_TTL
+        cache.set(worker_key(self.worker_id), self.summary(current), ttl)
+        workers = cache.get(WORKERS_KEY) or {}
+        now = time.time()
+        workers = {
+            worker: seen for worker, seen in workers.items()
+            if now - seen < ttl
+        }
+        workers[self.worker_id] = now
+        cache.set(WORKERS_KEY, workers, ttl)
+
+    def top_allocations(self, limit):
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        if self.baseline is not None:
+            stats = snapshot.compare_to(self.baseline, 'traceback')
+        else:
+            stats = snapshot.statistics('traceback')
+        return [
+            {
+                'size': stat.size,
+                'size_diff': getattr(stat, 'size_diff', None),
+                'count': stat.count,
+                'traceback': '\n'.join(stat.traceback.format(limit=5)),
+            }
+            for stat in stats[:limit]
+        ]
+
+    def should_recycle(self, current):
+        limit = settings.MEMORY_RECYCLE_MB * MB
+        return bool(limit) and current > limit and not self.recycling
+
+    def recycle(self, current):
+        self.recycling = True
+        self.publish(current)
+        if 'gunicorn.arbiter' not in sys.modules:
+            logger.warning(
+                'Worker %s uses %.0f MB, above MEMORY_RECYCLE_MB; '
+                'not running under gunicorn, recycling skipped',
+                self.worker_id, current / MB,
+            )
+            return
+        logger.warning(
+            'Worker %s uses %.0f MB, above MEMORY_RECYCLE_MB; recycling',
+            self.worker_id, current / MB,
+        )
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+_accounting = None
+
+
+def get_accounting():
+    global _accounting
+    if _accounting is None or _accounting.worker_id != (
+        f'{socket.gethostname()}:{os.getpid()}'
+    ):
+        _accounting = MemoryAccounting()
+    return _accounting
+
+
+def collect():
+    workers = []
+    for worker in sorted(cache.get(WORKERS_KEY) or {}):
+        summary = cache.get(worker_key(worker))
+        if summary is not None:
+            workers.append(summary)
+    views = defaultdict(ViewMemory)
+    for summary in workers:
+        for view, stats in summary['views'].items():
+            total = views[view]
+            total.requests += stats['requests']
+            total.rss += stats['rss']
+            total.rss_max = max(total.rss_max, stats['rss_max'])
+            total.traced += stats['traced']
+            total.traced_max = max(total.traced_max, stats['traced_max'])
+    return workers, [
+        {
+            'view': view,
+            'requests': stats.requests,
+            'rss_mean': stats.rss / stats.requests,
+            'rss_max': stats.rss_max,
+            'traced_mean': stats.traced / stats.requests,
+            'traced_max': stats.traced_max,
+        }
+        for view, stats in sorted(
+            views.items(), key=lambda item: item[1].rss, reverse=True
+        )
+    ]
+
+
+def memory_report(request):
+    accounting = get_accounting() if settings.MEMORY_ACCOUNTING else None
+    if accounting is not None:
+        accounting.publish()
+    workers, views = collect()
+    return render(request, 'admin/memory.html', {
+        'title': 'Память воркеров',
+        'enabled': settings.MEMORY_ACCOUNTING,
+        'worker': accounting.worker_id if accounting else None,
+        'workers': workers,
+        'views': views,
+        'allocations': (
+            accounting.top_allocations(settings.MEMORY_TOP)
+            if accounting else []
+        ),
+    })
@@ -0,0 +1,148 @@
+import cProfile
+import time
+
+from django.conf import settings
+from django.core.handlers.exception import convert_exception_to_response
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .compression import compress_response
+from .inspector import QueryInspector, report
+from .memory import get_accounting, rss, traced
+from .profiling import QueryRecorder, save_profile, should_profile
+
+
+class ProfilerMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request):
+            return self.get_response(request)
+        profile = cProfile.Profile()
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            profile.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profile.disable()
+        duration = (time.perf_counter() - start) * 1000
+        recorder.explain_slow()
+        save_profile(request, response, profile, recorder, duration)
+        return response
+
+
+class CompressionMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path_info.startswith(settings.API_URL_PREFIX):
+            return response
+        return compress_response(request, response)
+
+
+class MemoryMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.MEMORY_ACCOUNTING:
+            return self.get_response(request)
+        accounting = get_accounting()
+        rss_before, traced_before = rss(), traced()
+        response = self.get_response(request)
+        match = request.resolver_match
+        current = accounting.record(
+            match.view_name if match else 'unresolved',
+            rss_before,
+            traced_before,
+        )
+        if accounting.should_recycle(current):
+            accounting.recycle(current)
+        return response
+
+
+class QueryInspectorMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (settings.QUERY_INSPECTOR or settings.QUERY_INSPECTOR_RAISE):
+            return self.get_response(request)
+        inspector = QueryInspector()
+        with connection.execute_wrapper(inspector):
+            response = self.get_response(request)
+        report(request, inspector)
+        return response
+
+
+class BrowserMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.chain = None
+
+    def is_api(self, request):
+        return request.path_info.startswith(settings.API_URL_PREFIX)
+
+    def load(self):
+        view_middleware = []
+        template_response_middleware = []
+        exception_middleware = []
+        handler = convert_exception_to_response(self.get_response)
+        for path in reversed(settings.BROWSER_MIDDLEWARE):
+            middleware = import_string(path)(handler)
+            if hasattr(middleware, 'process_view'):
+                view_middleware.insert(0, middleware.process_view)
+            if hasattr(middleware, 'process_template_response'):
+                template_response_middleware.append(
+                    middleware.process_template_response
+                )
+            if hasattr(middleware, 'process_exception'):
+                exception_middleware.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+        self.chain = (
+            handler,
+            view_middleware,
+            template_response_middleware,
+            exception_middleware,
+        )
+        return self.chain
+
+    def __call__(self, request):
+        if self.is_api(request):
+            return self.get_response(request)
+        return (self.chain or self.load())[0](request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_api(request):
+            return None
+        for method in (self.chain or self.load())[1]:
+            response = method(request, view_func, view_args, view_kwargs)
+            if response:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if self.is_api(request):
+            return response
+        for method in (self.chain or self.load())[2]:
+            response = method(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_api(request):
+            return None
+        for method in (self.chain or self.load())[3]:
+            response = method(request, exception)
+            if response:
+                return response
+        return None
@@ -1,4 +1,24 @@
-from rest_framework import mixins, viewsets
+import hashlib
+import json
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from reviews.catalog import get_snapshot
+
+from .exceptions import PreconditionFailedError
+from .fragments import render, splice
+from .jobs import purge_cache
+from .throttling import client_ident
 
 
 class CreateListDestroyViewSet(
@@ -8,3 +28,251 @@ class CreateListDestroyViewSet(
     viewsets.GenericViewSet
 ):
     pass
+
+
+class CatalogListMixin:
+
+    def list(self, request, *args, **kwargs):
+        snapshot = get_snapshot(self.queryset.model)
+        items = snapshot.search(
+            filters.SearchFilter().get_search_terms(request),
+            [field.lstrip('^') for field in self.search_fields],
+        )
+        page = self.paginate_queryset(items)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(items, many=True).data)
+
+
+def idempotency_keys(request, key):
+    scope = (
+        request.user.pk if request.user.is_authenticated
+        else client_ident(request)
+    )
+    digest = hashlib.sha256(
+        f'{scope}:{request.path}:{key}'.encode()
+    ).hexdigest()
+    return f'idempotency:{digest}', f'idempotency-lock:{digest}'
+
+
+def replay(stored, fingerprint):
+    if stored['fingerprint'] != fingerprint:
+        return Response(
+            {'detail': 'Idempotency-Key was used with another body.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(
+        stored['data'],
+        status=stored['status'],
+        headers={'Idempotent-Replayed': 'true'}
+    )
+
+
+def acquire_lock(lock_key):
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_TIMEOUT
+    while not cache.add(lock_key, token, settings.IDEMPOTENCY_LOCK_TTL):
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(0.05)
+    return token
+
+
+def release_lock(lock_key, token):
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def idempotent(create):
+
+    def execute(view, request, response_key, fingerprint, *args, **kwargs):
+        try:
+            response = create(view, request, *args, **kwargs)
+        except APIException as exc:
+            response = view.handle_exception(exc)
+        cache.set(
+            response_key,
+            {
+                'fingerprint': fingerprint,
+                'status': response.status_code,
+                'data': response.data,
+            },
+            settings.IDEMPOTENCY_TTL
+        )
+        return response
+
+    @wraps(create)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.META.get('HTTP_IDEMPOTENCY_KEY')
+        if not key:
+            return create(view, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response(
+                {'detail': 'Idempotency-Key is too long.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        response_key, lock_key = idempotency_keys(request, key)
+        fingerprint = hashlib.sha256(json.dumps(
+            request.data, sort_keys=True, default=str
+        ).encode()).hexdigest()
+        token = acquire_lock(lock_key)
+        if token is None:
+            return Response(
+                {'detail': 'A request with this key is in progress.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        try:
+            stored = cache.get(response_key)
+            if stored is None:
+                return execute(
+                    view, request, response_key, fingerprint, *args, **kwargs
+                )
+        finally:
+            release_lock(lock_key, token)
+        return replay(stored, fingerprint)
+
+    return wrapper
+
+
+class IdempotentCreateMixin:
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+
+def if_match_versions(request):
+    header = request.META.get('HTTP_IF_MATCH', '').strip()
+    if not header or header == '*':
+        return None
+    versions = set()
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag.isdigit():
+            versions.add(int(tag))
+    return versions
+
+
+class VersionedMixin:
+    versioned_actions = ('retrieve', 'update', 'partial_update', 'destroy')
+    versioned_object = None
+
+    def check_version(self, instance):
+        versions = if_match_versions(self.request)
+        if versions is not None and instance.version not in versions:
+            raise PreconditionFailedError
+        self.versioned_object = instance
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.action not in self.versioned_actions:
+            return instance
+        if self.request.method in SAFE_METHODS:
+            self.versioned_object = instance
+        else:
+            self.check_version(instance)
+        return instance
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['if_match'] = 'HTTP_IF_MATCH' in self.request.META
+        return context
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if self.versioned_object is not None and response.status_code == 200:
+            response['ETag'] = f'"{self.versioned_object.version}"'
+        return response
+
+
+class FragmentListMixin:
+
+    def use_fragments(self, request):
+        return (
+            settings.FRAGMENT_CACHE
+            and request.accepted_renderer.format == 'json'
+            and 'include' not in request.query_params
+        )
+
+    def fragments(self, rows):
+        keys = OrderedDict((row[0], self.fragment_key(row)) for row in rows)
+        fragments = cache.get_many(list(keys.values()))
+        missing = [pk for pk, key in keys.items() if key not in fragments]
+        if missing:
+            rendered = {
+                keys[pk]: render(self.get_serializer(instance).data)
+                for pk, instance in self.fragment_objects(missing).items()
+            }
+            cache.set_many(rendered, settings.FRAGMENT_TTL)
+            fragments.update(rendered)
+        return [fragments[key] for key in keys.values() if key in fragments]
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fragments(request):
+            return super().list(request, *args, **kwargs)
+        rows = self.fragment_rows()
+        page = self.paginate_queryset(rows)
+        results = splice(self.fragments(rows if page is None else page))
+        if page is None:
+            return HttpResponse(results, content_type='application/json')
+        envelope = render(OrderedDict([
+            ('count', self.paginator.page.paginator.count),
+            ('next', self.paginator.get_next_link()),
+            ('previous', self.paginator.get_previous_link()),
+        ]))
+        return HttpResponse(
+            envelope[:-1] + b',"results":' + results + b'}',
+            content_type='application/json',
+        )
+
+
+class MicroCacheMixin:
+    cached_actions = ('list', 'retrieve')
+    cached_statuses = (status.HTTP_200_OK, status.HTTP_404_NOT_FOUND)
+
+    def object_pk(self):
+        if self.detail:
+            return self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        return None
+
+    def surrogate_keys(self, pk):
+        return []
+
+    def purge_keys(self, pk):
+        return self.surrogate_keys(pk)
+
+    def patch_cache_headers(self, request, response):
+        patch_vary_headers(response, ('Authorization',))
+        if 'HTTP_AUTHORIZATION' in request.META:
+            patch_cache_control(response, private=True, no_cache=True)
+            return
+        if response.status_code not in self.cached_statuses:
+            return
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=0,
+            s_maxage=settings.MICROCACHE_TTL,
+            stale_while_revalidate=settings.MICROCACHE_STALE,
+        )
+        response['Surrogate-Key'] = ' '.join(
+            self.surrogate_keys(self.object_pk())
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if request.method not in SAFE_METHODS:
+            if (settings.CACHE_PURGE_BACKEND
+                    and status.is_success(response.status_code)):
+                purge_cache.delay(self.purge_keys(self.object_pk()))
+        elif self.action in self.cached_actions:
+            self.patch_cache_headers(request, response)
+        return response
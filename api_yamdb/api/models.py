@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class StreamEvent(models.Model):
+    channel = models.CharField(max_length=50)
+    event = models.CharField(max_length=30)
+    data = models.TextField()
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['channel', 'id'], name='event_channel_idx'),
+        ]
+        verbose_name = 'Событие'
+        verbose_name_plural = 'События'
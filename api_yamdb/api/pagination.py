@@ -0,0 +1,5 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AuthorCursorPagination(CursorPagination):
+    ordering = '-pub_date'
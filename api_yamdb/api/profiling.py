@@ -0,0 +1,132 @@
+import io
+import json
+import os
+import pstats
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import Http404
+from django.shortcuts import render
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'params': params if not many else None,
+                'duration': (time.perf_counter() - start) * 1000,
+            })
+
+    def explain_slow(self):
+        threshold = settings.PROFILER_SLOW_QUERY_MS
+        prefix = (
+            'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite'
+            else 'EXPLAIN '
+        )
+        for query in self.queries:
+            if query['duration'] < threshold or not query['sql'].lstrip(
+            ).upper().startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + query['sql'], query['params'])
+                query['explain'] = [
+                    ' '.join(str(column) for column in row)
+                    for row in cursor.fetchall()
+                ]
+
+
+def is_admin(request):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            user = (JWTAuthentication().authenticate(request) or (None,))[0]
+        except APIException:
+            return False
+    return bool(user and user.is_authenticated and user.is_admin)
+
+
+def should_profile(request):
+    if 'HTTP_X_PROFILE' in request.META or 'profile' in request.GET:
+        return is_admin(request)
+    rate = settings.PROFILER_SAMPLE_RATE
+    return bool(rate) and random.randrange(rate) == 0
+
+
+def profile_stats(profile):
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats('cumulative').print_stats(settings.PROFILER_TOP)
+    return stream.getvalue()
+
+
+def save_profile(request, response, profile, recorder, duration):
+    os.makedirs(settings.PROFILER_DIR, exist_ok=True)
+    match = request.resolver_match
+    view = match.view_name if match else 'unresolved'
+    name = f'{time.time_ns()}-{view.replace(":", "-")}.json'
+    record = {
+        'name': name,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': view,
+        'status': response.status_code,
+        'duration': duration,
+        'queries': recorder.queries,
+        'stats': profile_stats(profile),
+    }
+    with open(os.path.join(settings.PROFILER_DIR, name), 'w') as record_file:
+        json.dump(record, record_file, default=str)
+    rotate()
+
+
+def list_profiles():
+    try:
+        names = os.listdir(settings.PROFILER_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        (name for name in names if name.endswith('.json')), reverse=True
+    )
+
+
+def rotate():
+    for name in list_profiles()[settings.PROFILER_KEEP:]:
+        os.remove(os.path.join(settings.PROFILER_DIR, name))
+
+
+def load_profile(name):
+    if name not in list_profiles():
+        raise Http404
+    with open(os.path.join(settings.PROFILER_DIR, name)) as record_file:
+        return json.load(record_file)
+
+
+def profile_list(request):
+    profiles = []
+    for name in list_profiles():
+        record = load_profile(name)
+        record['query_count'] = len(record.pop('queries'))
+        profiles.append(record)
+    return render(request, 'admin/profiles.html', {
+        'title': 'Профили запросов',
+        'profiles': profiles,
+    })
+
+
+def profile_detail(request, name):
+    return render(request, 'admin/profile_detail.html', {
+        'title': 'Профиль запроса',
+        'profile': load_profile(name),
+    })
@@ -0,0 +1,74 @@
+import threading
+from collections import deque
+
+import requests
+from django.conf import settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+ROUTES = {
+    'titles': ('api:titles-list', ()),
+    'title': ('api:titles-detail', ('pk',)),
+    'genres': ('api:genres-list', ()),
+    'categories': ('api:categories-list', ()),
+    'reviews': ('api:reviews-list', ('title_id',)),
+    'review': ('api:reviews-detail', ('title_id', 'pk')),
+}
+
+
+def surrogate_key(name, *args):
+    return '-'.join(map(str, (name, *args)))
+
+
+def key_path(key):
+    name, *args = key.split('-')
+    if name not in ROUTES:
+        return None
+    url_name, kwargs = ROUTES[name]
+    return reverse(url_name, kwargs=dict(zip(kwargs, args)))
+
+
+class MemoryBackend:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.purged = deque(maxlen=settings.CACHE_PURGE_MEMORY_SIZE)
+
+    def purge(self, keys):
+        with self.lock:
+            self.purged.extend(keys)
+
+
+class NginxBackend:
+    encodings = ('br', 'gzip', 'identity')
+    timeout = 5
+
+    def __init__(self):
+        self.session = requests.Session()
+
+    def refresh(self, path, encoding):
+        response = self.session.get(
+            settings.CACHE_PURGE_URL + path,
+            headers={'Accept': 'application/json',
+                     'Accept-Encoding': encoding},
+            timeout=self.timeout,
+        )
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    def purge(self, keys):
+        for path in filter(None, map(key_path, keys)):
+            for encoding in self.encodings:
+                self.refresh(path, encoding)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = import_string(settings.CACHE_PURGE_BACKEND)()
+    return _backend
@@ -2,9 +2,12 @@ from datetime import datetime
 
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
+from reviews.catalog import get_snapshot
+from reviews.counters import title_stats
 from reviews.models import (
     UserCode,
     Comment,
@@ -12,13 +15,51 @@ from reviews.models import (
     Title,
     Genre,
     Category,
-    GenreTitle
+    GenreTitle,
+    TitleStats,
 )
+from reviews.versioning import save_changes
+
+from .exceptions import EditConflictError, PreconditionFailedError
 
 User = get_user_model()
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class VersionedUpdateMixin:
+
+    def update(self, instance, validated_data):
+        changed, many_to_many = [], {}
+        for name, value in validated_data.items():
+            if instance._meta.get_field(name).many_to_many:
+                if set(getattr(instance, name).all()) != set(value):
+                    many_to_many[name] = value
+            elif getattr(instance, name) != value:
+                setattr(instance, name, value)
+                changed.append(name)
+        if not (changed or many_to_many):
+            return instance
+        with transaction.atomic():
+            if not save_changes(instance, changed, instance.version):
+                if self.context.get('if_match'):
+                    raise PreconditionFailedError
+                raise EditConflictError
+            for name, value in many_to_many.items():
+                getattr(instance, name).set(value)
+        return instance
+
+
+class CatalogSlugField(serializers.SlugRelatedField):
+
+    def to_internal_value(self, data):
+        item = get_snapshot(self.get_queryset().model).by_slug.get(data)
+        if item is None:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=str(data)
+            )
+        return item
+
+
+class ReviewSerializer(VersionedUpdateMixin, serializers.ModelSerializer):
     title = serializers.SlugRelatedField(
         slug_field='name',
         queryset=Title.objects.all()
@@ -46,10 +87,20 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
     class Meta:
-        fields = ('id', 'text', 'author', 'score', 'pub_date',)
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count',
+        )
         model = Review
 
 
+class AuthorReviewSerializer(ReviewSerializer):
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
+    title_name = serializers.CharField(source='title.name', read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title', 'title_name')
+
+
 class CommentSerializer(serializers.ModelSerializer):
     review = serializers.SlugRelatedField(
         slug_field='text',
@@ -65,6 +116,19 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
+class AuthorCommentSerializer(CommentSerializer):
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+    title_name = serializers.CharField(
+        source='review.title.name', read_only=True
+    )
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + (
+            'review', 'title', 'title_name',
+        )
+
+
 class UserCodeSerializer(serializers.ModelSerializer):
     username = serializers.SlugRelatedField(
         slug_field='username',
@@ -84,7 +148,7 @@ class UserCodeSerializer(serializers.ModelSerializer):
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(VersionedUpdateMixin, serializers.ModelSerializer):
 
     class Meta:
         model = User
@@ -133,10 +197,21 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class TitleStatsSerializer(serializers.ModelSerializer):
+    votes = serializers.ReadOnlyField()
+    median = serializers.ReadOnlyField()
+    histogram = serializers.ReadOnlyField()
+
+    class Meta:
+        model = TitleStats
+        fields = ('votes', 'median', 'histogram')
+
+
 class TitleGetSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True, required=False)
     category = CategorySerializer()
     rating = serializers.SerializerMethodField('get_rating')
+    stats = serializers.SerializerMethodField()
 
     class Meta:
         model = Title
@@ -147,11 +222,25 @@ class TitleGetSerializer(serializers.ModelSerializer):
             'description',
             'rating',
             'genre',
-            'category'
+            'category',
+            'reviews_count',
+            'stats',
         )
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'stats' not in self.context.get('include', ()):
+            del fields['stats']
+        return fields
+
+    def get_stats(self, obj):
+        return TitleStatsSerializer(title_stats(obj)).data
+
     def get_rating(self, obj):
-        rating = obj.reviews.aggregate(Avg('score')).get('score__avg')
+        if hasattr(obj, 'rating'):
+            rating = obj.rating
+        else:
+            rating = obj.reviews.aggregate(Avg('score')).get('score__avg')
         if not rating:
             return rating
         return round(rating, 1)
@@ -179,13 +268,13 @@ class TitleGetSerializer(serializers.ModelSerializer):
         return value
 
 
-class TitleSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+class TitleSerializer(VersionedUpdateMixin, serializers.ModelSerializer):
+    genre = CatalogSlugField(
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True
     )
-    category = serializers.SlugRelatedField(
+    category = CatalogSlugField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
@@ -201,3 +290,11 @@ class TitleSerializer(serializers.ModelSerializer):
                 'Год выхода не может быть больше текущего года'
             )
         return value
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+    )
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False)
@@ -0,0 +1,105 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Comment, Review, Title, User
+
+from .events import publish, title_channel
+from .fragments import (
+    comment_key,
+    forget,
+    forget_author,
+    forget_reviews,
+    forget_titles,
+    review_key,
+    title_key,
+)
+from .serializers import CommentSerializer, ReviewSerializer
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    publish(
+        title_channel(instance.title_id),
+        'review.created' if created else 'review.updated',
+        ReviewSerializer(instance).data,
+    )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    publish(
+        title_channel(instance.title_id),
+        'review.deleted',
+        {'id': instance.pk},
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    data = CommentSerializer(instance).data
+    data['review'] = instance.review_id
+    publish(
+        title_channel(instance.review.title_id),
+        'comment.created' if created else 'comment.updated',
+        data,
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    review = Review.objects.filter(pk=instance.review_id).values_list(
+        'title_id', flat=True
+    ).first()
+    if review is None:
+        return
+    publish(
+        title_channel(review),
+        'comment.deleted',
+        {'id': instance.pk, 'review': instance.review_id},
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_fragment_saved(sender, instance, created, raw, update_fields,
+                          **kwargs):
+    if raw:
+        return
+    if created or update_fields is None or 'score' in update_fields:
+        forget_titles([instance.title_id])
+
+
+@receiver(post_delete, sender=Review)
+def review_fragment_deleted(sender, instance, **kwargs):
+    forget([review_key(instance.pk, instance.version)])
+    forget_titles([instance.title_id])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_fragment_changed(sender, instance, **kwargs):
+    forget([comment_key(instance.pk)])
+    forget_reviews(Review.objects.filter(pk=instance.review_id))
+
+
+@receiver(post_delete, sender=Title)
+def title_fragment_deleted(sender, instance, **kwargs):
+    forget([title_key(instance.pk, instance.version)])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    forget_titles((pk_set or []) if reverse else [instance.pk])
+
+
+@receiver(post_save, sender=User)
+def author_fragment_saved(sender, instance, created, raw, update_fields,
+                          **kwargs):
+    if created or raw:
+        return
+    if update_fields is None or 'username' in update_fields:
+        forget_author(instance.pk)
@@ -0,0 +1,89 @@
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def client_ident(request):
+    return BaseThrottle().get_ident(request)
+
+
+def parse_rate(rate):
+    count, period = rate.split('/')
+    return PERIODS[period[0]] * 1000 // int(count), int(count)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+
+    def __init__(self):
+        self.wait_ms = 0
+
+    def get_scope(self, view):
+        return self.scope
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        ident = self.get_ident_key(request, view)
+        if rate is None or ident is None:
+            return True
+        interval, burst = parse_rate(rate)
+        key = f'throttle:{scope}:{ident}'
+        now = int(time.time() * 1000)
+        tolerance = interval * (burst - 1)
+        timeout = (interval + tolerance) // 1000 + 1
+        if cache.add(key, now + interval, timeout):
+            return True
+        try:
+            arrival = cache.incr(key, interval) - interval
+        except ValueError:
+            cache.set(key, now + interval, timeout)
+            return True
+        if arrival < now:
+            cache.set(key, now + interval, timeout)
+            return True
+        if arrival - now > tolerance:
+            cache.decr(key, interval)
+            self.wait_ms = arrival - now - tolerance
+            return False
+        cache.touch(key, timeout)
+        return True
+
+    def wait(self):
+        return self.wait_ms / 1000
+
+
+class AnonBucketThrottle(TokenBucketThrottle):
+    scope = 'anon'
+
+    def get_ident_key(self, request, view):
+        if request.user.is_authenticated:
+            return None
+        return client_ident(request)
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    scope = 'user'
+
+    def get_ident_key(self, request, view):
+        if not request.user.is_authenticated:
+            return None
+        return request.user.pk
+
+
+class ScopedBucketThrottle(TokenBucketThrottle):
+
+    def get_scope(self, view):
+        return getattr(view, 'throttle_scope', None)
+
+    def get_ident_key(self, request, view):
+        if request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return client_ident(request)
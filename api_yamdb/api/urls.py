@@ -2,6 +2,7 @@ from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 
 from .views import (
+    BatchView,
     TitleViewSet,
     GenreViewSet,
     CategoryViewSet,
@@ -10,6 +11,7 @@ from .views import (
     UserViewSet,
     ReviewViewSet,
     CommentViewSet,
+    title_events,
 )
 from .routers import CustomPostOnlyRouter
 
@@ -30,6 +32,12 @@ router.register(
     CommentViewSet, basename='comments'
 )
 urlpatterns = [
+    path(
+        'v1/titles/<int:title_id>/events/',
+        title_events,
+        name='title-events'
+    ),
+    path('v1/batch/', BatchView.as_view(), name='batch'),
     path('v1/', include(router.urls)),
     path('v1/auth/', include(auth_router.urls)),
 ]
@@ -1,19 +1,46 @@
-from django.core.mail import send_mail
+import json
+import queue
+import time
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.db.models import Avg, F, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status, filters, viewsets, mixins
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import (
+    SAFE_METHODS,
+    AllowAny,
+    IsAuthenticated,
+)
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from reviews.models import (
+    Review,
+    UserCode,
+    Title,
+    Genre,
+    Category,
+    Comment,
+    CommentArchive,
+    TitleStats,
+)
+from reviews.catalog import current_version
+from reviews.counters import title_stats
+from reviews.similarity import get_index
 
-from reviews.models import Review, UserCode, Title, Genre, Category, Comment
 from .serializers import (
+    AuthorCommentSerializer,
+    AuthorReviewSerializer,
+    BatchItemSerializer,
     UserCodeSerializer,
     SignUpSerializer,
     UserSerializer,
@@ -21,6 +48,7 @@ from .serializers import (
     ReviewSerializer,
     TitleSerializer,
     TitleGetSerializer,
+    TitleStatsSerializer,
     GenreSerializer,
     CategorySerializer,
 )
@@ -29,13 +57,27 @@ from .permissions import (
     IsAdminOrReadOnly,
     IsAdminModeratorAuthorOrReadOnly,
 )
-from .filters import TitleFilter
-from .mixins import CreateListDestroyViewSet
+from .batch import execute_batch
+from .events import get_broker, title_channel
+from .filters import StableOrderingFilter, TitleFilter
+from .fragments import comment_key, review_key, title_key
+from .jobs import send_confirmation_code
+from .pagination import AuthorCursorPagination
+from .mixins import (
+    CatalogListMixin,
+    CreateListDestroyViewSet,
+    FragmentListMixin,
+    IdempotentCreateMixin,
+    MicroCacheMixin,
+    VersionedMixin,
+    idempotent,
+)
+from .purge import surrogate_key
 
 User = get_user_model()
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(VersionedMixin, ModelViewSet):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     pagination_class = PageNumberPagination
@@ -43,6 +85,13 @@ class UserViewSet(ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     filterset_fields = ('username')
     permission_classes = (IsAdmin,)
+    query_budget = {
+        'list': 4,
+        'me_reviews': 3,
+        'me_comments': 3,
+        'user_reviews': 3,
+        'user_comments': 3,
+    }
 
     def perform_update(self, serializer):
         user = self.request.user
@@ -58,11 +107,17 @@ class UserViewSet(ModelViewSet):
     )
     def username(self, request, username):
         user = get_object_or_404(User, username=username)
+        self.check_version(user)
         if request.method == 'GET':
             data = UserSerializer(user).data
             return Response(data, status=status.HTTP_200_OK)
         if request.method == 'PATCH':
-            serializer = UserSerializer(user, data=request.data, partial=True)
+            serializer = UserSerializer(
+                user,
+                data=request.data,
+                partial=True,
+                context=self.get_serializer_context(),
+            )
             serializer.is_valid(raise_exception=True)
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -77,17 +132,80 @@ class UserViewSet(ModelViewSet):
         permission_classes=[IsAuthenticated, ]
     )
     def me(self, request):
-        user = get_object_or_404(User, username=self.request.user)
+        user = request.user
+        self.check_version(user)
         if request.method == 'GET':
             data = UserSerializer(user).data
             return Response(data, status=status.HTTP_200_OK)
-        serializer = UserSerializer(user, data=request.data, partial=True)
+        serializer = UserSerializer(
+            user,
+            data=request.data,
+            partial=True,
+            context=self.get_serializer_context(),
+        )
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def author_page(self, queryset, serializer_class):
+        paginator = AuthorCursorPagination()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    def reviews_page(self, author):
+        return self.author_page(
+            Review.objects.filter(author=author).select_related(
+                'title', 'author'
+            ),
+            AuthorReviewSerializer,
+        )
+
+    def comments_page(self, author):
+        return self.author_page(
+            Comment.objects.filter(author=author).select_related(
+                'review__title', 'author'
+            ),
+            AuthorCommentSerializer,
+        )
+
+    @action(
+        detail=False,
+        url_path='me/reviews',
+        permission_classes=[IsAuthenticated, ]
+    )
+    def me_reviews(self, request):
+        return self.reviews_page(request.user)
+
+    @action(
+        detail=False,
+        url_path='me/comments',
+        permission_classes=[IsAuthenticated, ]
+    )
+    def me_comments(self, request):
+        return self.comments_page(request.user)
+
+    @action(
+        detail=False,
+        url_path=r'(?P<username>\w+)/reviews',
+        permission_classes=[AllowAny, ]
+    )
+    def user_reviews(self, request, username):
+        return self.reviews_page(get_object_or_404(User, username=username))
+
+    @action(
+        detail=False,
+        url_path=r'(?P<username>\w+)/comments',
+        permission_classes=[AllowAny, ]
+    )
+    def user_comments(self, request, username):
+        return self.comments_page(get_object_or_404(User, username=username))
+
 
 class TokenObtainViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
+    throttle_scope = 'auth'
     serializer_class = UserCodeSerializer
     permission_classes = (AllowAny,)
 
@@ -110,7 +228,9 @@ class TokenObtainViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
 class SignUpViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     serializer_class = SignUpSerializer
     permission_classes = (AllowAny,)
+    throttle_scope = 'auth'
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -119,24 +239,19 @@ class SignUpViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
             email=serializer.data.get('email')
         )
         confirmation_code = default_token_generator.make_token(user)
-        mailing_code = send_mail(
-            subject='Код подтверждения от YaMdb',
-            message=f'Your confirmation_code is {confirmation_code}',
-            from_email=settings.EMAIL_ADMIN,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
         if UserCode.objects.filter(username=user).exists():
             UserCode.objects.filter(username=user).delete()
         UserCode.objects.create(
             username=user,
             confirmation_code=confirmation_code
         )
-        mailing_code
+        send_confirmation_code.delay(user.email, confirmation_code)
         return Response(data=request.data, status=status.HTTP_200_OK)
 
 
-class CategoryViewSet(CreateListDestroyViewSet):
+class CategoryViewSet(
+    MicroCacheMixin, CatalogListMixin, CreateListDestroyViewSet
+):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     filter_backends = (filters.SearchFilter,)
@@ -144,8 +259,16 @@ class CategoryViewSet(CreateListDestroyViewSet):
     permission_classes = (IsAdminOrReadOnly,)
     lookup_field = 'slug'
 
+    def surrogate_keys(self, pk):
+        return ['categories']
+
+    def purge_keys(self, pk):
+        return ['categories', 'catalog', 'titles']
 
-class GenreViewSet(CreateListDestroyViewSet):
+
+class GenreViewSet(
+    MicroCacheMixin, CatalogListMixin, CreateListDestroyViewSet
+):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     filter_backends = (filters.SearchFilter,)
@@ -153,24 +276,157 @@ class GenreViewSet(CreateListDestroyViewSet):
     permission_classes = (IsAdminOrReadOnly,)
     lookup_field = 'slug'
 
+    def surrogate_keys(self, pk):
+        return ['genres']
+
+    def purge_keys(self, pk):
+        return ['genres', 'catalog', 'titles']
 
-class TitleViewSet(viewsets.ModelViewSet):
+
+def latest_comments(review_ids, limit):
+    ranked = Comment.objects.filter(review_id__in=review_ids).annotate(
+        row_number=Window(
+            expression=RowNumber(),
+            partition_by=[F('review_id')],
+            order_by=[F('pub_date').desc(), F('id').desc()],
+        )
+    ).order_by()
+    sql, params = ranked.query.sql_with_params()
+    comments = list(Comment.objects.raw(
+        f'SELECT * FROM ({sql}) ranked WHERE ranked.row_number <= %s '
+        'ORDER BY ranked.review_id, ranked.row_number',
+        (*params, limit),
+    ))
+    prefetch_related_objects(comments, 'author')
+    return comments
+
+
+class TitleViewSet(
+    MicroCacheMixin, FragmentListMixin, VersionedMixin, viewsets.ModelViewSet
+):
     queryset = Title.objects.all()
     serializer_class = TitleSerializer
     search_fields = ('^genre', )
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, StableOrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ('reviews_count',)
+    throttle_scope = 'catalog'
+    query_budget = {'list': 5, 'retrieve': 6, 'similar': 4, 'stats': 3}
+
+    def includes(self):
+        return set(self.request.query_params.get('include', '').split(','))
+
+    def get_queryset(self):
+        queryset = Title.objects.select_related('category')
+        if 'stats' in self.includes():
+            queryset = queryset.select_related('stats')
+        return queryset.prefetch_related('genre').annotate(
+            rating=Avg('reviews__score')
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = self.includes()
+        return context
+
+    def surrogate_keys(self, pk):
+        if pk is None:
+            return ['catalog', 'titles']
+        return ['catalog', surrogate_key('title', pk)]
+
+    def purge_keys(self, pk):
+        keys = ['titles']
+        if pk is not None:
+            keys.append(surrogate_key('title', pk))
+        return keys
+
+    def fragment_rows(self):
+        self.generation = current_version()
+        return self.filter_queryset(Title.objects.all()).values_list(
+            'pk', 'version'
+        )
+
+    def fragment_key(self, row):
+        return title_key(*row, self.generation)
+
+    def fragment_objects(self, ids):
+        return self.get_queryset().in_bulk(ids)
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return TitleGetSerializer
         return TitleSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        title = self.get_object()
+        data = self.get_serializer(title).data
+        include = self.includes()
+        if include & {'reviews', 'reviews.comments'}:
+            data['reviews'] = self.included_reviews(
+                title, 'reviews.comments' in include
+            )
+        return Response(data)
+
+    def included_reviews(self, title, with_comments):
+        reviews = list(
+            title.reviews.select_related('author')[
+                :settings.INCLUDE_REVIEWS_LIMIT
+            ]
+        )
+        data = ReviewSerializer(
+            reviews, many=True, context=self.get_serializer_context()
+        ).data
+        if not with_comments:
+            return data
+        comments = {review.pk: [] for review in reviews}
+        for comment in latest_comments(
+            comments, settings.INCLUDE_COMMENTS_LIMIT
+        ):
+            comments[comment.review_id].append(comment)
+        for review, review_data in zip(reviews, data):
+            review_data['comments'] = CommentSerializer(
+                comments[review.pk], many=True
+            ).data
+        return data
+
+    @action(methods=['GET'], detail=True)
+    def stats(self, request, pk):
+        stats = None
+        if pk.isdigit():
+            stats = TitleStats.objects.filter(pk=pk).first()
+        if stats is None:
+            stats = title_stats(self.get_object())
+        return Response(TitleStatsSerializer(stats).data)
+
+    @action(methods=['GET'], detail=True)
+    def similar(self, request, pk):
+        index = get_index()
+        neighbors = None
+        if index and pk.isdigit():
+            neighbors = index.neighbors(int(pk))
+        if neighbors is None:
+            self.get_object()
+            neighbors = []
+        titles = self.get_queryset().in_bulk(neighbors)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in neighbors if pk in titles], many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    MicroCacheMixin,
+    FragmentListMixin,
+    VersionedMixin,
+    IdempotentCreateMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = ReviewSerializer
     permission_classes = (IsAdminModeratorAuthorOrReadOnly,)
+    filter_backends = (StableOrderingFilter,)
+    ordering_fields = ('comments_count',)
+    query_budget = {'list': 4, 'retrieve': 4}
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
@@ -180,12 +436,44 @@ class ReviewViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         title_id = self.kwargs.get('title_id')
         title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all()
+        return title.reviews.select_related('author')
 
+    def surrogate_keys(self, pk):
+        title_id = self.kwargs.get('title_id')
+        if pk is None:
+            return [surrogate_key('reviews', title_id)]
+        return [surrogate_key('review', title_id, pk)]
+
+    def purge_keys(self, pk):
+        title_id = self.kwargs.get('title_id')
+        keys = [
+            'titles',
+            surrogate_key('title', title_id),
+            surrogate_key('reviews', title_id),
+        ]
+        if pk is not None:
+            keys.append(surrogate_key('review', title_id, pk))
+        return keys
+
+    def fragment_rows(self):
+        self.generation = current_version()
+        return self.filter_queryset(self.get_queryset()).values_list(
+            'pk', 'version'
+        )
+
+    def fragment_key(self, row):
+        return review_key(*row, self.generation)
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def fragment_objects(self, ids):
+        return Review.objects.select_related('author').in_bulk(ids)
+
+
+class CommentViewSet(
+    FragmentListMixin, IdempotentCreateMixin, viewsets.ModelViewSet
+):
     serializer_class = CommentSerializer
     permission_classes = (IsAdminModeratorAuthorOrReadOnly, )
+    query_budget = {'list': 6, 'retrieve': 5}
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
@@ -194,9 +482,120 @@ class CommentViewSet(viewsets.ModelViewSet):
         review = get_object_or_404(Review, id=review_id, title=title)
         serializer.save(author=self.request.user, review=review)
 
-    def get_queryset(self):
+    def review_comments(self):
         title_id = self.kwargs.get('title_id')
         title = get_object_or_404(Title, id=title_id)
         review_id = self.kwargs.get('review_id')
         review = get_object_or_404(Review, id=review_id, title=title)
-        return Comment.objects.filter(review=review)
+        return (
+            Comment.objects.filter(review=review),
+            CommentArchive.objects.filter(review=review).order_by(),
+        )
+
+    def get_queryset(self):
+        comments, archived = self.review_comments()
+        if self.action != 'list':
+            return comments.select_related('author')
+        return comments.order_by().union(archived, all=True).order_by(
+            '-pub_date'
+        ).prefetch_related('author')
+
+    def fragment_rows(self):
+        self.generation = current_version()
+        comments, archived = self.review_comments()
+        return comments.order_by().values_list('pk', 'pub_date').union(
+            archived.values_list('pk', 'pub_date'), all=True
+        ).order_by('-pub_date')
+
+    def fragment_key(self, row):
+        return comment_key(row[0], self.generation)
+
+    def fragment_objects(self, ids):
+        comments = Comment.objects.select_related('author').in_bulk(ids)
+        archived = set(ids) - set(comments)
+        if archived:
+            comments.update(
+                CommentArchive.objects.select_related('author').in_bulk(
+                    archived
+                )
+            )
+        return comments
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if self.request.method not in SAFE_METHODS:
+                raise
+        comment = get_object_or_404(
+            CommentArchive,
+            review=self.kwargs.get('review_id'),
+            review__title=self.kwargs.get('title_id'),
+            pk=self.kwargs.get('pk'),
+        )
+        self.check_object_permissions(self.request, comment)
+        return comment
+
+
+class BatchView(APIView):
+    permission_classes = (AllowAny,)
+
+    def post(self, request):
+        size = int(request.META.get('CONTENT_LENGTH') or 0)
+        if size > settings.BATCH_MAX_SIZE:
+            return Response(
+                {'detail': f'Batch body exceeds {settings.BATCH_MAX_SIZE}.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        serializer = BatchItemSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+        if not 0 < len(items) <= settings.BATCH_MAX_ITEMS:
+            return Response(
+                {'detail': f'Send 1 to {settings.BATCH_MAX_ITEMS} requests.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            execute_batch(request, items), status=status.HTTP_200_OK
+        )
+
+
+def format_event(event):
+    data = json.dumps(event.data, ensure_ascii=False)
+    return f'id: {event.id}\nevent: {event.event}\ndata: {data}\n\n'
+
+
+def event_stream(subscription):
+    deadline = time.monotonic() + settings.EVENTS_STREAM_TIMEOUT
+    yield f'retry: {settings.EVENTS_RETRY * 1000}\n\n'
+    try:
+        while time.monotonic() < deadline and not subscription.overflowed:
+            try:
+                event = subscription.get(settings.EVENTS_HEARTBEAT)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event)
+        if subscription.overflowed:
+            yield from map(format_event, subscription.drain())
+    finally:
+        subscription.close()
+
+
+@require_GET
+def title_events(request, title_id):
+    get_object_or_404(Title, pk=title_id)
+    last_event_id = request.META.get(
+        'HTTP_LAST_EVENT_ID', request.GET.get('last_event_id')
+    )
+    if last_event_id is not None:
+        last_event_id = int(last_event_id) if last_event_id.isdigit() else 0
+    subscription = get_broker().subscribe(
+        title_channel(title_id), last_event_id
+    )
+    response = StreamingHttpResponse(
+        event_stream(subscription), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,68 @@
+import logging
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+from django.utils import translation
+from rest_framework.serializers import ModelSerializer
+from rest_framework.settings import api_settings
+from reviews.catalog import get_snapshot
+from reviews.models import Category, Genre
+from reviews.similarity import get_index
+
+from . import serializers
+
+logger = logging.getLogger(__name__)
+
+
+def warm_models():
+    for model in apps.get_models():
+        model._meta.get_fields(include_hidden=True)
+
+
+def warm_serializers():
+    for value in vars(serializers).values():
+        if (isinstance(value, type) and issubclass(value, ModelSerializer)
+                and value.__module__ == serializers.__name__):
+            value().fields
+
+
+def warm_settings():
+    for name in api_settings.defaults:
+        getattr(api_settings, name)
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.gettext('This field is required.')
+
+
+def warm_caches():
+    try:
+        get_snapshot(Genre)
+        get_snapshot(Category)
+    except DatabaseError as error:
+        logger.warning('Catalog snapshots are not warmed: %s', error)
+    get_index()
+
+
+def warm():
+    start = time.perf_counter()
+    try:
+        get_resolver().reverse_dict
+        warm_settings()
+        warm_models()
+        warm_serializers()
+        warm_caches()
+    finally:
+        connections.close_all()
+    return (time.perf_counter() - start) * 1000
+
+
+def connect():
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except DatabaseError as error:
+            logger.warning(
+                'Cannot connect to database %s: %s', connection.alias, error
+            )
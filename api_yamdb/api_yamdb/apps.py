@@ -0,0 +1,6 @@
+from django.contrib.staticfiles.apps import StaticFilesConfig
+
+
+class StaticConfig(StaticFilesConfig):
+    # CSV fixtures for load_csv live next to redoc.yaml but are not public.
+    ignore_patterns = StaticFilesConfig.ignore_patterns + ['data']
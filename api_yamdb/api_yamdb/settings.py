@@ -21,12 +21,13 @@ ALLOWED_HOSTS = [
 INSTALLED_APPS = [
     'api.apps.ApiConfig',
     'reviews.apps.ReviewsConfig',
+    'jobs.apps.JobsConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
-    'django.contrib.staticfiles',
+    'api_yamdb.apps.StaticConfig',
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
@@ -34,14 +35,30 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.MemoryMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'api.middleware.BrowserMiddleware',
+    'api.middleware.ProfilerMiddleware',
+    'api.middleware.QueryInspectorMiddleware',
+]
+
+# Middleware for admin and redoc only, skipped for API_URL_PREFIX requests
+# that authenticate with JWT.
+BROWSER_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+API_URL_PREFIX = '/api/'
+
+# Admin checks look for session, auth and messages middleware in MIDDLEWARE
+# only; BrowserMiddleware runs them for every non-API request.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
@@ -73,7 +90,23 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=0)),
+    }
+}
+
+# Cache
+
+# Every gunicorn worker has its own local-memory cache, so deployments
+# with several workers should point CACHE_BACKEND at memcached. With a
+# local cache the catalog version expires after CATALOG_LOCAL_TTL seconds.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
     }
 }
 
@@ -115,7 +148,11 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 
 STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.getenv(
+    'STATIC_ROOT', default=os.path.join(os.path.dirname(BASE_DIR), 'static')
+)
+STATICFILES_STORAGE = 'api_yamdb.storage.CompressedManifestStaticFilesStorage'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -139,8 +176,34 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 4,
 
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.AnonBucketThrottle',
+        'api.throttling.UserBucketThrottle',
+        'api.throttling.ScopedBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': os.getenv('THROTTLE_ANON', default='120/min'),
+        'user': os.getenv('THROTTLE_USER', default='600/min'),
+        'catalog': os.getenv('THROTTLE_CATALOG', default='60/min'),
+        'auth': os.getenv('THROTTLE_AUTH', default='10/min'),
+    },
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=1)),
 }
 
+INCLUDE_REVIEWS_LIMIT = 5
+INCLUDE_COMMENTS_LIMIT = 3
+
+BATCH_MAX_ITEMS = 20
+BATCH_MAX_SIZE = 256 * 1024
+BATCH_THREADS = 4
+
+IDEMPOTENCY_TTL = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TIMEOUT = 10
+# A lock has to outlive the slowest handler, and gunicorn kills a worker
+# after GUNICORN_TIMEOUT seconds.
+IDEMPOTENCY_LOCK_TTL = 2 * int(os.getenv('GUNICORN_TIMEOUT', default=30))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(weeks=100),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -148,3 +211,68 @@ SIMPLE_JWT = {
 }
 
 EMAIL_ADMIN = 'from@example.com'
+
+SIMILAR_TITLES_INDEX = os.getenv(
+    'SIMILAR_TITLES_INDEX',
+    default=os.path.join(BASE_DIR, 'similar_titles.idx')
+)
+SIMILAR_TITLES_TOP_K = 10
+
+EVENTS_BROKER = os.getenv('EVENTS_BROKER', default='api.events.DatabaseBroker')
+EVENTS_BUFFER_SIZE = 100
+EVENTS_HISTORY_SIZE = 500
+EVENTS_RETENTION = 60 * 60
+EVENTS_CLEANUP_RATE = 0.01
+EVENTS_POLL_INTERVAL = 1
+EVENTS_POLL_LOOKBACK = 10
+EVENTS_HEARTBEAT = 15
+EVENTS_RETRY = 3
+EVENTS_STREAM_TIMEOUT = 5 * 60
+
+PROFILER_SAMPLE_RATE = int(os.getenv('PROFILER_SAMPLE_RATE', default=0))
+PROFILER_SLOW_QUERY_MS = 100
+PROFILER_TOP = 50
+PROFILER_KEEP = 200
+PROFILER_DIR = os.getenv(
+    'PROFILER_DIR', default=os.path.join(BASE_DIR, 'profiles')
+)
+
+QUERY_INSPECTOR = bool(int(os.getenv('QUERY_INSPECTOR', default=int(DEBUG))))
+QUERY_INSPECTOR_RAISE = bool(int(os.getenv('QUERY_INSPECTOR_RAISE', default=0)))
+QUERY_INSPECTOR_DUPLICATES = 3
+
+JOBS_PROCESSES = int(os.getenv('JOBS_PROCESSES', default=1))
+JOBS_THREADS = int(os.getenv('JOBS_THREADS', default=4))
+JOBS_POLL_INTERVAL = 1
+JOBS_MAX_ATTEMPTS = 3
+JOBS_BACKOFF = 30
+JOBS_HEARTBEAT_INTERVAL = 10
+JOBS_HEARTBEAT_TIMEOUT = 60
+JOBS_RETENTION = 7 * 24 * 60 * 60
+
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', default=1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', default=5))
+COMPRESSION_BROTLI_QUALITY = int(
+    os.getenv('COMPRESSION_BROTLI_QUALITY', default=4)
+)
+
+STARTUP_IMPORT_BUDGET = int(os.getenv('STARTUP_IMPORT_BUDGET', default=1000))
+
+MEMORY_ACCOUNTING = bool(int(os.getenv('MEMORY_ACCOUNTING', default=0)))
+MEMORY_TRACEMALLOC = bool(int(os.getenv('MEMORY_TRACEMALLOC', default=0)))
+MEMORY_TRACEMALLOC_FRAMES = 10
+MEMORY_RECYCLE_MB = int(os.getenv('MEMORY_RECYCLE_MB', default=0))
+MEMORY_PUBLISH_EVERY = 50
+MEMORY_SUMMARY_TTL = 24 * 60 * 60
+MEMORY_TOP = 30
+
+FRAGMENT_CACHE = bool(int(os.getenv('FRAGMENT_CACHE', default=1)))
+FRAGMENT_TTL = 24 * 60 * 60
+
+MICROCACHE_TTL = int(os.getenv('MICROCACHE_TTL', default=5))
+MICROCACHE_STALE = 60
+CACHE_PURGE_BACKEND = os.getenv('CACHE_PURGE_BACKEND', default='')
+CACHE_PURGE_MEMORY_SIZE = 1000
+CACHE_PURGE_URL = os.getenv('CACHE_PURGE_URL', default='http://nginx:8080')
+
+CATALOG_LOCAL_TTL = 30
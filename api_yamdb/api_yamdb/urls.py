@@ -1,8 +1,25 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import TemplateView
+from api.memory import memory_report
+from api.profiling import profile_detail, profile_list
 
 urlpatterns = [
+    path(
+        'admin/profiles/',
+        admin.site.admin_view(profile_list),
+        name='profile-list'
+    ),
+    path(
+        'admin/profiles/<str:name>/',
+        admin.site.admin_view(profile_detail),
+        name='profile-detail'
+    ),
+    path(
+        'admin/memory/',
+        admin.site.admin_view(memory_report),
+        name='memory-report'
+    ),
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
     path(
@@ -0,0 +1,17 @@
+import os
+
+bind = '0:8000'
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from api.warmup import warm
+        server.log.info('Warmed up in %.0f ms', warm())
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from api.warmup import connect
+        connect()
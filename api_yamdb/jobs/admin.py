@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Job, Schedule
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+
+
+admin.site.register(Schedule)
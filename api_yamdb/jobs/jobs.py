@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import job
+
+
+@job(every=timedelta(hours=1))
+def purge_jobs():
+    Job.objects.filter(
+        status__in=(Job.DONE, Job.FAILED),
+        finished_at__lt=timezone.now() - timedelta(
+            seconds=settings.JOBS_RETENTION
+        ),
+    ).delete()
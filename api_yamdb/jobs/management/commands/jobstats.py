@@ -0,0 +1,53 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.db.models import Count, Min
+from django.utils import timezone
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Show job queue metrics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=int, default=24, help='Window for run metrics'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        counts = dict(Job.objects.values_list('status').annotate(
+            total=Count('id')
+        ).order_by())
+        self.stdout.write(', '.join(
+            f'{status}: {counts.get(status, 0)}'
+            for status, _ in Job.STATUS_CHOICES
+        ))
+        oldest = Job.objects.filter(
+            status=Job.QUEUED, run_at__lte=now
+        ).aggregate(oldest=Min('run_at'))['oldest']
+        lag = (now - oldest).total_seconds() if oldest else 0
+        self.stdout.write(f'queue lag: {lag:.1f} s')
+        window = now - timedelta(hours=options['hours'])
+        runs = defaultdict(list)
+        for name, status, attempts, started, finished in Job.objects.filter(
+            finished_at__gte=window
+        ).values_list(
+            'name', 'status', 'attempts', 'started_at', 'finished_at'
+        ).order_by().iterator():
+            runs[name].append((status, attempts, finished - started))
+        self.stdout.write(
+            f'{"job":<48}{"done":>7}{"failed":>8}{"retries":>9}'
+            f'{"avg s":>9}{"max s":>9}'
+        )
+        for name, items in sorted(runs.items()):
+            durations = [duration.total_seconds() for *_, duration in items]
+            self.stdout.write(
+                f'{name:<48}'
+                f'{sum(status == Job.DONE for status, *_ in items):>7}'
+                f'{sum(status == Job.FAILED for status, *_ in items):>8}'
+                f'{sum(attempts - 1 for _, attempts, _ in items):>9}'
+                f'{sum(durations) / len(durations):>9.2f}'
+                f'{max(durations):>9.2f}'
+            )
@@ -0,0 +1,49 @@
+import signal
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.JOBS_PROCESSES
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.JOBS_THREADS
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once no job is ready to run',
+        )
+
+    def handle(self, *args, **options):
+        if options['processes'] > 1:
+            return self.supervise(options)
+        Worker(options['threads'], options['burst']).run()
+
+    def supervise(self, options):
+        command = [
+            sys.executable, sys.argv[0], 'runworker',
+            '--processes', '1', '--threads', str(options['threads']),
+        ]
+        if options['burst']:
+            command.append('--burst')
+        children = [
+            subprocess.Popen(command) for _ in range(options['processes'])
+        ]
+
+        def stop(signum, frame):
+            for child in children:
+                child.send_signal(signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for child in children:
+            child.wait()
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+def fill_heartbeats(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.filter(heartbeat_at__isnull=True).update(
+        heartbeat_at=models.F('started_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последний сигнал обработчика'),
+        ),
+        migrations.RunPython(fill_heartbeats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+import json
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'queued'),
+        (RUNNING, 'running'),
+        (DONE, 'done'),
+        (FAILED, 'failed'),
+    ]
+    name = models.CharField('Задача', max_length=200)
+    payload = models.TextField('Аргументы', default='{}')
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUS_CHOICES, default=QUEUED
+    )
+    run_at = models.DateTimeField('Запуск не раньше', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток', default=3
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    worker = models.CharField('Обработчик', max_length=100, blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    started_at = models.DateTimeField('Начата', null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        'Последний сигнал обработчика', null=True, blank=True
+    )
+    finished_at = models.DateTimeField('Завершена', null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'run_at'], name='job_status_run_at_idx'
+            ),
+        ]
+        ordering = ('-created',)
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+    @property
+    def arguments(self):
+        payload = json.loads(self.payload)
+        return payload.get('args', []), payload.get('kwargs', {})
+
+
+class Schedule(models.Model):
+    name = models.CharField('Задача', max_length=200, unique=True)
+    next_run_at = models.DateTimeField('Следующий запуск')
+
+    class Meta:
+        verbose_name = 'Расписание'
+        verbose_name_plural = 'Расписания'
+
+    def __str__(self):
+        return self.name
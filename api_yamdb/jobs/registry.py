@@ -0,0 +1,44 @@
+import functools
+import json
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+REGISTRY = {}
+
+
+class JobFunction:
+
+    def __init__(self, func, name, max_attempts, backoff, every):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts or settings.JOBS_MAX_ATTEMPTS
+        self.backoff = backoff or settings.JOBS_BACKOFF
+        self.every = every
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return self.schedule(None, *args, **kwargs)
+
+    def schedule(self, run_at, *args, **kwargs):
+        return Job.objects.create(
+            name=self.name,
+            payload=json.dumps({'args': args, 'kwargs': kwargs}),
+            run_at=run_at or timezone.now(),
+            max_attempts=self.max_attempts,
+        )
+
+
+def job(name=None, max_attempts=None, backoff=None, every=None):
+    def decorator(func):
+        job_name = name or f'{func.__module__}.{func.__name__}'
+        REGISTRY[job_name] = JobFunction(
+            func, job_name, max_attempts, backoff, every
+        )
+        return REGISTRY[job_name]
+    return decorator
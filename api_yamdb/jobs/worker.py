@@ -0,0 +1,207 @@
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import (
+    DatabaseError,
+    IntegrityError,
+    close_old_connections,
+    connection,
+    transaction,
+)
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job, Schedule
+from .registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+def claim(worker, limit=1):
+    now = timezone.now()
+    queued = Job.objects.filter(
+        status=Job.QUEUED, run_at__lte=now
+    ).order_by('run_at')
+    started = dict(
+        status=Job.RUNNING,
+        worker=worker,
+        started_at=now,
+        heartbeat_at=now,
+        attempts=F('attempts') + 1,
+    )
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(queued.select_for_update(
+                skip_locked=True
+            ).values_list('id', flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(**started)
+    else:
+        ids = [
+            job_id for job_id in queued.values_list('id', flat=True)[:limit]
+            if queued.filter(id=job_id).update(**started)
+        ]
+    return list(Job.objects.filter(id__in=ids))
+
+
+def retry_delay(job, func):
+    backoff = func.backoff if func else settings.JOBS_BACKOFF
+    return timedelta(
+        seconds=backoff * 2 ** (job.attempts - 1) * random.uniform(1, 1.5)
+    )
+
+
+def execute(job):
+    func = REGISTRY.get(job.name)
+    args, kwargs = job.arguments
+    try:
+        if func is None:
+            raise LookupError(f'Unknown job {job.name}')
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Job %s #%s failed', job.name, job.pk)
+        now = timezone.now()
+        failed = Job.objects.filter(pk=job.pk)
+        if job.attempts < job.max_attempts:
+            failed.update(
+                status=Job.QUEUED,
+                run_at=now + retry_delay(job, func),
+                worker='',
+                last_error=traceback.format_exc(),
+            )
+        else:
+            failed.update(
+                status=Job.FAILED,
+                finished_at=now,
+                last_error=traceback.format_exc(),
+            )
+        return False
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE, finished_at=timezone.now()
+    )
+    return True
+
+
+def run_schedules():
+    now = timezone.now()
+    scheduled = {
+        name: func for name, func in REGISTRY.items() if func.every
+    }
+    known = dict(Schedule.objects.filter(
+        name__in=scheduled
+    ).values_list('name', 'next_run_at'))
+    for name, func in scheduled.items():
+        if name not in known:
+            try:
+                Schedule.objects.create(name=name, next_run_at=now)
+            except IntegrityError:
+                continue
+            known[name] = now
+        if known[name] > now:
+            continue
+        with transaction.atomic():
+            if Schedule.objects.filter(
+                name=name, next_run_at=known[name]
+            ).update(next_run_at=now + func.every):
+                func.delay()
+
+
+def heartbeat(job_ids):
+    Job.objects.filter(
+        status=Job.RUNNING, id__in=job_ids
+    ).update(heartbeat_at=timezone.now())
+
+
+def requeue_stale():
+    stale = Job.objects.filter(
+        status=Job.RUNNING,
+        heartbeat_at__lt=timezone.now() - timedelta(
+            seconds=settings.JOBS_HEARTBEAT_TIMEOUT
+        ),
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED,
+        finished_at=timezone.now(),
+        last_error='Worker stopped responding',
+    )
+    stale.update(status=Job.QUEUED, worker='')
+
+
+class Worker:
+
+    def __init__(self, threads, burst=False):
+        self.threads = threads
+        self.burst = burst
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self.running = set()
+
+    def work(self, number):
+        name = f'{self.name}:{number}'
+        while not self.stopping.is_set():
+            close_old_connections()
+            try:
+                jobs = claim(name)
+            except DatabaseError:
+                logger.exception('Could not claim jobs')
+                jobs = []
+            self.running.update(job.pk for job in jobs)
+            for job in jobs:
+                try:
+                    execute(job)
+                except DatabaseError:
+                    logger.exception('Could not record job #%s', job.pk)
+                finally:
+                    self.running.discard(job.pk)
+            if not jobs:
+                if self.burst:
+                    break
+                self.stopping.wait(settings.JOBS_POLL_INTERVAL)
+        connection.close()
+
+    def schedule(self):
+        while not self.stopping.is_set():
+            close_old_connections()
+            try:
+                run_schedules()
+                requeue_stale()
+            except DatabaseError:
+                logger.exception('Could not run schedules')
+            self.stopping.wait(settings.JOBS_POLL_INTERVAL)
+        connection.close()
+
+    def beat(self):
+        while not self.stopping.wait(settings.JOBS_HEARTBEAT_INTERVAL):
+            close_old_connections()
+            try:
+                heartbeat(self.running.copy())
+            except DatabaseError:
+                logger.exception('Could not send heartbeat')
+        connection.close()
+
+    def stop(self, signum=None, frame=None):
+        self.stopping.set()
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self.work, args=(number,))
+            for number in range(self.threads)
+        ]
+        if not self.burst:
+            threads.append(threading.Thread(target=self.schedule))
+        beat = threading.Thread(target=self.beat)
+        for thread in (*threads, beat):
+            thread.start()
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(0.5)
+        self.stop()
+        beat.join()
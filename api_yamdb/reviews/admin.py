@@ -1,7 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (
+    Category,
+    Comment,
+    CommentArchive,
+    Genre,
+    Review,
+    Title,
+    TitleStats,
+    User,
+)
 
 admin.site.register(User, UserAdmin)
 admin.site.register(Title)
@@ -9,3 +18,5 @@ admin.site.register(Genre)
 admin.site.register(Category)
 admin.site.register(Review)
 admin.site.register(Comment)
+admin.site.register(CommentArchive)
+admin.site.register(TitleStats)
@@ -0,0 +1,89 @@
+import sys
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+VERSION_KEY = 'catalog:version'
+
+
+class CatalogSnapshot:
+
+    def __init__(self, model, version):
+        self.version = version
+        rows = model.objects.order_by('name', 'pk').values_list(
+            'id', 'name', 'slug'
+        )
+        self.items = tuple(
+            model.from_db(rows.db, ('id', 'name', 'slug'), row)
+            for row in rows
+        )
+        self.by_slug = {item.slug: item for item in self.items}
+        self.indexes = {
+            field: self.build_index(field) for field in ('name', 'slug')
+        }
+
+    def build_index(self, field):
+        entries = sorted(
+            (getattr(item, field).casefold(), position)
+            for position, item in enumerate(self.items)
+        )
+        return (
+            [key for key, _ in entries],
+            [position for _, position in entries],
+        )
+
+    def prefix(self, field, term):
+        keys, positions = self.indexes[field]
+        term = term.casefold()
+        start = bisect_left(keys, term)
+        end = bisect_left(keys, term + chr(sys.maxunicode), start)
+        return positions[start:end]
+
+    def search(self, terms, fields):
+        matches = None
+        for term in terms:
+            found = set()
+            for field in fields:
+                found.update(self.prefix(field, term))
+            matches = found if matches is None else matches & found
+        if matches is None:
+            return list(self.items)
+        return [self.items[position] for position in sorted(matches)]
+
+
+_snapshots = {}
+
+
+def is_local_cache():
+    return isinstance(caches['default'], LocMemCache)
+
+
+def version_ttl():
+    return settings.CATALOG_LOCAL_TTL if is_local_cache() else None
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, version_ttl())
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_snapshot(model):
+    version = current_version()
+    snapshot = _snapshots.get(model)
+    if snapshot is None or snapshot.version != version:
+        snapshot = CatalogSnapshot(model, version)
+        _snapshots[model] = snapshot
+    return snapshot
+
+
+def bump_version():
+    transaction.on_commit(
+        lambda: cache.set(VERSION_KEY, uuid.uuid4().hex, version_ttl())
+    )
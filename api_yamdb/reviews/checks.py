@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .catalog import is_local_cache
+
+
+@register(Tags.caches, deploy=True)
+def shared_cache_check(app_configs, **kwargs):
+    if not is_local_cache():
+        return []
+    return [Warning(
+        'The default cache is local to each process.',
+        hint=(
+            'Catalog snapshots and cached fragments in other workers are '
+            f'refreshed only every {settings.CATALOG_LOCAL_TTL} seconds; '
+            'set CACHE_BACKEND to memcached.'
+        ),
+        id='reviews.W001',
+    )]
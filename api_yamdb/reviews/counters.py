@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .catalog import bump_version
+from .models import SCORES, Comment, CommentArchive, Review, Title, TitleStats
+
+BATCH_SIZE = 500
+
+
+def count_subquery(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(
+                **{field: OuterRef('pk')}
+            ).order_by().values(field).annotate(
+                total=Count('pk')
+            ).values('total')
+        ),
+        0
+    )
+
+
+def recount():
+    titles = Title.objects.update(
+        reviews_count=count_subquery(Review, 'title')
+    )
+    reviews = Review.objects.update(
+        comments_count=(
+            count_subquery(Comment, 'review')
+            + count_subquery(CommentArchive, 'review')
+        )
+    )
+    bump_version()
+    return titles, reviews
+
+
+def score_histograms(reviews):
+    return reviews.order_by().values('title_id').annotate(**{
+        TitleStats.field(score): Count('pk', filter=Q(score=score))
+        for score in SCORES
+    })
+
+
+def title_histogram(title_id):
+    for histogram in score_histograms(
+        Review.objects.filter(title_id=title_id)
+    ):
+        histogram.pop('title_id')
+        return histogram
+    return {}
+
+
+def title_stats(title):
+    try:
+        return title.stats
+    except TitleStats.DoesNotExist:
+        return TitleStats(title=title, **title_histogram(title.pk))
+
+
+def adjust_stats(title_id, added=None, removed=None):
+    changes = {}
+    if added:
+        field = TitleStats.field(added)
+        changes[field] = F(field) + 1
+    if removed:
+        field = TitleStats.field(removed)
+        changes[field] = Greatest(F(field) - 1, 0)
+    if not changes:
+        return
+    updated = TitleStats.objects.filter(title_id=title_id).update(**changes)
+    if not updated and added:
+        TitleStats.objects.get_or_create(
+            title_id=title_id, defaults=title_histogram(title_id)
+        )
+
+
+@transaction.atomic
+def recount_stats():
+    histograms = {
+        row.pop('title_id'): row
+        for row in score_histograms(Review.objects.all())
+    }
+    TitleStats.objects.all().delete()
+    stats = TitleStats.objects.bulk_create((
+        TitleStats(title_id=title_id, **histograms.get(title_id, {}))
+        for title_id in Title.objects.values_list('pk', flat=True)
+    ), batch_size=BATCH_SIZE)
+    return len(stats)
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from jobs.registry import job
+
+from .counters import recount, recount_stats
+from .partitions import create_partitions, is_partitioned
+from .similarity import build_index, refresh_index
+from .snapshot import snapshot
+
+
+@job(every=timedelta(days=1))
+def recount_counters():
+    recount()
+    recount_stats()
+
+
+@job(every=timedelta(hours=1))
+def refresh_similar_titles():
+    try:
+        refresh_index()
+    except FileNotFoundError:
+        build_index()
+
+
+@job(every=timedelta(days=1))
+def maintain_comment_partitions():
+    if is_partitioned():
+        create_partitions(3)
+
+
+@job()
+def export_snapshot(path):
+    snapshot(path)
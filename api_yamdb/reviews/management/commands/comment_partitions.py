@@ -0,0 +1,55 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from reviews.partitions import (
+    archive,
+    convert,
+    create_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = 'Manage monthly pub_date partitions of comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Turn the comments table into a partitioned one',
+        )
+        parser.add_argument(
+            '--ahead',
+            type=int,
+            default=3,
+            help='Months of future partitions to keep ready',
+        )
+        parser.add_argument(
+            '--archive',
+            type=int,
+            metavar='MONTHS',
+            help='Move comments older than MONTHS months to the archive',
+        )
+
+    def handle(self, *args, **options):
+        if options['archive'] is not None:
+            count = archive(options['archive'])
+            self.stdout.write(
+                self.style.SUCCESS(f'Successfully archived {count} comments')
+            )
+            return
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning requires PostgreSQL')
+        if options['convert']:
+            if is_partitioned():
+                raise CommandError('Comments are already partitioned')
+            convert(options['ahead'])
+            self.stdout.write(self.style.SUCCESS(
+                'Successfully converted comments to a partitioned table'
+            ))
+            return
+        if not is_partitioned():
+            raise CommandError('Run with --convert first')
+        created = create_partitions(options['ahead'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully created {len(created)} partitions'
+        ))
@@ -2,6 +2,7 @@ import csv
 
 from django.conf import settings
 from django.core.management import BaseCommand
+from reviews.counters import recount, recount_stats
 from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
                             Title, User)
 
@@ -27,5 +28,7 @@ class Command(BaseCommand):
             ) as csv_file:
                 reader = csv.DictReader(csv_file)
                 model.objects.bulk_create(model(**data) for data in reader)
+        recount()
+        recount_stats()
 
         self.stdout.write(self.style.SUCCESS('Successfully load data'))
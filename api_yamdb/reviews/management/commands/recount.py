@@ -0,0 +1,12 @@
+from django.core.management import BaseCommand
+from reviews.counters import recount
+
+
+class Command(BaseCommand):
+    help = 'Reconcile review and comment counters'
+
+    def handle(self, *args, **kwargs):
+        titles, reviews = recount()
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully recount {titles} titles and {reviews} reviews'
+        ))
@@ -0,0 +1,18 @@
+from django.core.management import BaseCommand, CommandError
+from reviews.snapshot import restore
+
+
+class Command(BaseCommand):
+    help = 'Replace the reviews tables with the contents of a snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Snapshot file to load')
+
+    def handle(self, *args, **options):
+        try:
+            counts = restore(options['path'])
+        except ValueError as error:
+            raise CommandError(error)
+        for model, rows in counts:
+            self.stdout.write(f'{model._meta.label}: {rows} rows')
+        self.stdout.write(self.style.SUCCESS('Successfully restored data'))
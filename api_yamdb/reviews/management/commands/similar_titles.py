@@ -0,0 +1,26 @@
+from django.core.management import BaseCommand
+from reviews.similarity import build_index, refresh_index
+
+
+class Command(BaseCommand):
+    help = 'Build the similar titles index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Recompute only the titles affected since the last build',
+        )
+        parser.add_argument('--top', type=int, help='Neighbors per title')
+
+    def handle(self, *args, **options):
+        if options['refresh']:
+            try:
+                count = refresh_index()
+            except FileNotFoundError:
+                count = build_index(k=options['top'])
+        else:
+            count = build_index(k=options['top'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully indexed {count} titles')
+        )
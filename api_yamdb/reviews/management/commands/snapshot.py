@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand
+from reviews.snapshot import snapshot
+
+
+class Command(BaseCommand):
+    help = 'Dump the reviews tables into a compressed snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Snapshot file to write')
+
+    def handle(self, *args, **options):
+        tables = snapshot(options['path'])
+        rows = sum(table['rows'] for table in tables)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully saved {rows} rows from {len(tables)} tables'
+        ))
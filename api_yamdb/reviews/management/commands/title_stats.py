@@ -0,0 +1,12 @@
+from django.core.management import BaseCommand
+from reviews.counters import recount_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild score histograms of all titles'
+
+    def handle(self, *args, **kwargs):
+        titles = recount_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully rebuilt score statistics of {titles} titles'
+        ))
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.16 on 2026-10-19 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title_id', models.IntegerField(db_index=True, verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Изменение для похожих произведений',
+                'verbose_name_plural': 'Изменения для похожих произведений',
+            },
+        ),
+    ]
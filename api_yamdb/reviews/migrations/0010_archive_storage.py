@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-19 19:30
+
+from django.db import migrations
+
+TOAST_TUPLE_TARGET = 128
+
+
+def compress_archive(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    CommentArchive = apps.get_model('reviews', 'CommentArchive')
+    table = schema_editor.quote_name(CommentArchive._meta.db_table)
+    schema_editor.execute(
+        f'ALTER TABLE {table} SET (toast_tuple_target = {TOAST_TUPLE_TARGET})'
+    )
+
+
+def reset_archive(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    CommentArchive = apps.get_model('reviews', 'CommentArchive')
+    table = schema_editor.quote_name(CommentArchive._meta.db_table)
+    schema_editor.execute(f'ALTER TABLE {table} RESET (toast_tuple_target)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_similarity_changes'),
+    ]
+
+    operations = [
+        migrations.RunPython(compress_archive, reset_archive),
+    ]
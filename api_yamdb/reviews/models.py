@@ -63,6 +63,11 @@ class User(AbstractUser):
         choices=ROLE_CHOICES,
         default='user'
     )
+    version = models.PositiveIntegerField(
+        'Версия',
+        default=1,
+        editable=False
+    )
 
     @property
     def is_admin(self):
@@ -114,6 +119,17 @@ class Title(models.Model):
         Genre,
         through='GenreTitle'
     )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        db_index=True,
+        editable=False
+    )
+    version = models.PositiveIntegerField(
+        'Версия',
+        default=1,
+        editable=False
+    )
 
     class Meta:
         ordering = ('year',)
@@ -124,6 +140,67 @@ class Title(models.Model):
         return self.name[:15]
 
 
+SCORES = range(1, 11)
+
+
+def score_counter(score):
+    return models.PositiveIntegerField(f'Оценок {score}', default=0)
+
+
+class TitleStats(models.Model):
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Произведение'
+    )
+    score_1 = score_counter(1)
+    score_2 = score_counter(2)
+    score_3 = score_counter(3)
+    score_4 = score_counter(4)
+    score_5 = score_counter(5)
+    score_6 = score_counter(6)
+    score_7 = score_counter(7)
+    score_8 = score_counter(8)
+    score_9 = score_counter(9)
+    score_10 = score_counter(10)
+
+    class Meta:
+        verbose_name = 'Статистика оценок'
+        verbose_name_plural = 'Статистика оценок'
+
+    def __str__(self):
+        return f'{self.title_id}: {self.histogram}'
+
+    @staticmethod
+    def field(score):
+        return f'score_{score}'
+
+    @property
+    def histogram(self):
+        return {score: getattr(self, self.field(score)) for score in SCORES}
+
+    @property
+    def votes(self):
+        return sum(self.histogram.values())
+
+    @property
+    def median(self):
+        votes = self.votes
+        if not votes:
+            return None
+        middle = ((votes - 1) // 2, votes // 2)
+        found, seen = [], 0
+        for score, count in self.histogram.items():
+            found.extend(
+                score for position in middle
+                if seen <= position < seen + count
+            )
+            seen += count
+        return sum(found) / 2
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
@@ -149,6 +226,16 @@ class Review(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    version = models.PositiveIntegerField(
+        'Версия',
+        default=1,
+        editable=False
+    )
 
     class Meta:
         constraints = [
@@ -156,6 +243,16 @@ class Review(models.Model):
                 fields=['author', 'title'],
                 name='unique review')
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'comments_count'],
+                name='review_title_comments_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='review_author_date_idx'
+            ),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
@@ -182,6 +279,12 @@ class Comment(models.Model):
     )
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='comment_author_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
@@ -190,6 +293,30 @@ class Comment(models.Model):
         return self.text
 
 
+class CommentArchive(models.Model):
+    id = models.IntegerField(primary_key=True)
+    review = models.ForeignKey(
+        Review, on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='Отзыв'
+    )
+    text = models.TextField(verbose_name='Текст')
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='Автор'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+        ordering = ('-pub_date',)
+
+    def __str__(self):
+        return self.text
+
+
 class UserCode(models.Model):
     username = models.ForeignKey(
         User,
@@ -211,5 +338,20 @@ class GenreTitle(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'],
+                name='unique genre title')
+        ]
+
     def __str__(self):
         return f'{self.genre} {self.title}'
+
+
+class SimilarityChange(models.Model):
+    title_id = models.IntegerField('Произведение', db_index=True)
+
+    class Meta:
+        verbose_name = 'Изменение для похожих произведений'
+        verbose_name_plural = 'Изменения для похожих произведений'
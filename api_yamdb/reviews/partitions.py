@@ -0,0 +1,192 @@
+from datetime import datetime
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Comment, CommentArchive, Review, User
+
+COLUMNS = 'id, review_id, text, author_id, pub_date'
+
+
+def table():
+    return Comment._meta.db_table
+
+
+def quote(name):
+    return connection.ops.quote_name(name)
+
+
+def month_start(moment, shift=0):
+    month = moment.year * 12 + moment.month - 1 + shift
+    return datetime(month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def bounds(start):
+    return [start.isoformat(), month_start(start, 1).isoformat()]
+
+
+def partition_name(start):
+    return f'{table()}_p{start:%Y%m}'
+
+
+def default_partition():
+    return f'{table()}_default'
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table '
+            'WHERE partrelid = to_regclass(%s)',
+            [table()]
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s)',
+            [table()]
+        )
+        names = [name for name, in cursor.fetchall()]
+    prefix = f'{table()}_p'
+    return sorted(
+        (datetime.strptime(name[len(prefix):], '%Y%m').replace(
+            tzinfo=timezone.utc
+        ), name)
+        for name in names if name.startswith(prefix)
+    )
+
+
+def create_partition(cursor, start):
+    name = partition_name(start)
+    cursor.execute(
+        f'CREATE TABLE {quote(name)} '
+        f'(LIKE {quote(table())} INCLUDING DEFAULTS)'
+    )
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {quote(default_partition())} '
+        f'WHERE pub_date >= %s AND pub_date < %s RETURNING {COLUMNS}) '
+        f'INSERT INTO {quote(name)} ({COLUMNS}) SELECT {COLUMNS} FROM moved',
+        bounds(start)
+    )
+    cursor.execute(
+        f'ALTER TABLE {quote(table())} ATTACH PARTITION {quote(name)} '
+        'FOR VALUES FROM (%s) TO (%s)',
+        bounds(start)
+    )
+
+
+@transaction.atomic
+def create_partitions(ahead):
+    existing = {start for start, _ in partitions()}
+    now = timezone.now()
+    created = []
+    with connection.cursor() as cursor:
+        for shift in range(ahead + 1):
+            start = month_start(now, shift)
+            if start not in existing:
+                create_partition(cursor, start)
+                created.append(partition_name(start))
+    return created
+
+
+def foreign_key(cursor, column, model):
+    cursor.execute(
+        f'ALTER TABLE {quote(table())} ADD CONSTRAINT '
+        f'{quote(f"{table()}_{column}_fk")} FOREIGN KEY ({column}) '
+        f'REFERENCES {quote(model._meta.db_table)} (id) '
+        'DEFERRABLE INITIALLY DEFERRED'
+    )
+
+
+@transaction.atomic
+def convert(ahead):
+    legacy = f'{table()}_legacy'
+    sequence = f'{table()}_id_seq'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'ALTER TABLE {quote(table())} RENAME TO {quote(legacy)}'
+        )
+        for index in Comment._meta.indexes:
+            cursor.execute(f'DROP INDEX IF EXISTS {quote(index.name)}')
+        cursor.execute(
+            f'CREATE TABLE {quote(table())} '
+            f'(LIKE {quote(legacy)} INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (pub_date)'
+        )
+        cursor.execute(
+            f'ALTER TABLE {quote(table())} ADD PRIMARY KEY (id, pub_date)'
+        )
+        cursor.execute(
+            f'ALTER SEQUENCE {quote(sequence)} '
+            f'OWNED BY {quote(table())}.id'
+        )
+        foreign_key(cursor, 'review_id', Review)
+        foreign_key(cursor, 'author_id', User)
+        for column in ('review_id', 'author_id', 'pub_date'):
+            cursor.execute(
+                f'CREATE INDEX {quote(f"{table()}_{column}_part_idx")} '
+                f'ON {quote(table())} ({column})'
+            )
+        with connection.schema_editor() as editor:
+            for index in Comment._meta.indexes:
+                editor.add_index(Comment, index)
+        cursor.execute(
+            f'CREATE TABLE {quote(default_partition())} '
+            f'PARTITION OF {quote(table())} DEFAULT'
+        )
+        cursor.execute(f'SELECT min(pub_date) FROM {quote(legacy)}')
+        oldest = cursor.fetchone()[0] or timezone.now()
+        start, end = month_start(oldest), month_start(timezone.now(), ahead)
+        while start <= end:
+            cursor.execute(
+                f'CREATE TABLE {quote(partition_name(start))} '
+                f'PARTITION OF {quote(table())} '
+                'FOR VALUES FROM (%s) TO (%s)',
+                bounds(start)
+            )
+            start = month_start(start, 1)
+        cursor.execute(
+            f'INSERT INTO {quote(table())} ({COLUMNS}) '
+            f'SELECT {COLUMNS} FROM {quote(legacy)}'
+        )
+        cursor.execute(f'DROP TABLE {quote(legacy)}')
+
+
+def move_to_archive(cursor, source, cutoff):
+    cutoff = connection.ops.adapt_datetimefield_value(cutoff)
+    cursor.execute(
+        f'INSERT INTO {quote(CommentArchive._meta.db_table)} ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM {quote(source)} WHERE pub_date < %s',
+        [cutoff]
+    )
+    moved = cursor.rowcount
+    cursor.execute(
+        f'DELETE FROM {quote(source)} WHERE pub_date < %s', [cutoff]
+    )
+    return moved
+
+
+@transaction.atomic
+def archive(months):
+    cutoff = month_start(timezone.now(), -months)
+    with connection.cursor() as cursor:
+        if not is_partitioned():
+            return move_to_archive(cursor, table(), cutoff)
+        moved = move_to_archive(cursor, default_partition(), cutoff)
+        for start, name in partitions():
+            if month_start(start, 1) > cutoff:
+                continue
+            cursor.execute(
+                f'ALTER TABLE {quote(table())} '
+                f'DETACH PARTITION {quote(name)}'
+            )
+            moved += move_to_archive(cursor, name, cutoff)
+            cursor.execute(f'DROP TABLE {quote(name)}')
+    return moved
@@ -0,0 +1,120 @@
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .catalog import bump_version
+from .counters import adjust_stats
+from .models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    TitleStats,
+    User,
+)
+from .similarity import mark_changed
+
+
+@receiver(post_save, sender=Review)
+def review_created(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        Title.objects.filter(pk=instance.title_id).update(
+            reviews_count=F('reviews_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    Title.objects.filter(
+        pk=instance.title_id, reviews_count__gt=0
+    ).update(reviews_count=F('reviews_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        Review.objects.filter(pk=instance.review_id).update(
+            comments_count=F('comments_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    Review.objects.filter(
+        pk=instance.review_id, comments_count__gt=0
+    ).update(comments_count=F('comments_count') - 1)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def catalog_changed(sender, **kwargs):
+    bump_version()
+
+
+@receiver(post_init, sender=Review)
+def review_loaded(sender, instance, **kwargs):
+    instance.loaded_score = instance.__dict__.get('score')
+
+
+@receiver(post_save, sender=Review)
+def review_scored(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        adjust_stats(instance.title_id, added=instance.score)
+        mark_changed([instance.title_id])
+    elif instance.loaded_score not in (None, instance.score):
+        adjust_stats(
+            instance.title_id,
+            added=instance.score,
+            removed=instance.loaded_score,
+        )
+        mark_changed([instance.title_id])
+    instance.loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_unscored(sender, instance, **kwargs):
+    adjust_stats(
+        instance.title_id, removed=instance.loaded_score or instance.score
+    )
+
+
+@receiver(post_save, sender=Title)
+def title_created(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        TitleStats.objects.get_or_create(title=instance)
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Title)
+@receiver(pre_save, sender=Review)
+def version_bumped(sender, instance, raw, update_fields, **kwargs):
+    if raw or instance._state.adding or update_fields is not None:
+        return
+    instance.version += 1
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def title_similarity_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_changed([instance.title_id])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_similarity_changed(sender, instance, action, reverse,
+                                    pk_set, **kwargs):
+    if action.startswith('post_'):
+        mark_changed((pk_set or []) if reverse else [instance.pk])
@@ -0,0 +1,255 @@
+import math
+import os
+import struct
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Max
+
+from .models import GenreTitle, Review, SimilarityChange, Title
+
+MAGIC = b'YSIM'
+HEADER = struct.Struct('<4sIIId')
+GENRE_WEIGHT = 0.5
+BLOCK_CELLS = 1 << 24
+
+
+def feature_block(title_ids, rows, columns, values, weight):
+    rows = np.asarray(rows, dtype=np.int64)
+    positions = np.searchsorted(title_ids, rows)
+    known = positions < len(title_ids)
+    known[known] = title_ids[positions[known]] == rows[known]
+    positions = positions[known]
+    features, columns = np.unique(
+        np.asarray(columns, dtype=np.int64)[known], return_inverse=True
+    )
+    values = np.asarray(values, dtype=np.float64)[known]
+    norms = np.sqrt(np.bincount(
+        positions, weights=values * values, minlength=len(title_ids)
+    ))
+    values = values / norms[positions] * math.sqrt(weight)
+    return positions, columns, values, len(features)
+
+
+def load_features():
+    # scipy is only needed to build the index, the web workers read it
+    # with numpy alone.
+    from scipy import sparse
+
+    title_ids = np.fromiter(
+        Title.objects.order_by('id').values_list('id', flat=True),
+        dtype=np.int64,
+    )
+    links = list(GenreTitle.objects.values_list('title_id', 'genre_id'))
+    reviews = list(
+        Review.objects.values_list('title_id', 'author_id', 'score')
+    )
+    genre_rows, genre_columns, genre_values, genres = feature_block(
+        title_ids,
+        [title_id for title_id, _ in links],
+        [genre_id for _, genre_id in links],
+        np.ones(len(links)),
+        GENRE_WEIGHT,
+    )
+    reader_rows, reader_columns, reader_values, readers = feature_block(
+        title_ids,
+        [title_id for title_id, _, _ in reviews],
+        [author_id for _, author_id, _ in reviews],
+        [score / 10 for _, _, score in reviews],
+        1 - GENRE_WEIGHT,
+    )
+    matrix = sparse.csr_matrix((
+        np.concatenate((genre_values, reader_values)),
+        (
+            np.concatenate((genre_rows, reader_rows)),
+            np.concatenate((genre_columns, reader_columns + genres)),
+        ),
+    ), shape=(len(title_ids), genres + readers))
+    return title_ids, matrix
+
+
+def top_neighbors(matrix, positions, k):
+    scores = (matrix[positions] @ matrix.T).toarray()
+    scores[np.arange(len(positions)), positions] = 0
+    width = min(k, scores.shape[1])
+    top = np.argpartition(-scores, width - 1, axis=1)[:, :width]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return (
+        np.take_along_axis(top, order, axis=1),
+        np.take_along_axis(top_scores, order, axis=1),
+    )
+
+
+def build_rows(title_ids, matrix, positions, k):
+    neighbors = np.zeros((len(positions), k), dtype=np.int64)
+    scores = np.zeros((len(positions), k), dtype=np.float32)
+    if not len(title_ids):
+        return neighbors, scores
+    size = max(1, BLOCK_CELLS // len(title_ids))
+    for start in range(0, len(positions), size):
+        block = positions[start:start + size]
+        top, top_scores = top_neighbors(matrix, block, k)
+        found = top_scores > 0
+        rows = slice(start, start + len(block))
+        width = top.shape[1]
+        neighbors[rows, :width] = np.where(found, title_ids[top], 0)
+        scores[rows, :width] = np.where(found, top_scores, 0)
+    return neighbors, scores
+
+
+def related_titles(matrix, positions):
+    related = np.zeros(matrix.shape[0], dtype=bool)
+    related[positions] = True
+    features = np.unique(matrix[positions].indices)
+    related[matrix.tocsc()[:, features].indices] = True
+    return related
+
+
+def write_index(path, title_ids, neighbors, scores, k):
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(descriptor, 'wb') as index_file:
+        index_file.write(
+            HEADER.pack(MAGIC, 1, k, len(title_ids), time.time())
+        )
+        index_file.flush()
+        title_ids.astype('<i8').tofile(index_file)
+        neighbors.astype('<i8').tofile(index_file)
+        scores.astype('<f4').tofile(index_file)
+    os.replace(tmp_path, path)
+
+
+def build_index(path=None, k=None):
+    path = path or settings.SIMILAR_TITLES_INDEX
+    k = k or settings.SIMILAR_TITLES_TOP_K
+    last_change = SimilarityChange.objects.aggregate(last=Max('pk'))['last']
+    title_ids, matrix = load_features()
+    neighbors, scores = build_rows(
+        title_ids, matrix, np.arange(len(title_ids)), k
+    )
+    write_index(path, title_ids, neighbors, scores, k)
+    clear_changes(last_change or 0)
+    return len(title_ids)
+
+
+def mark_changed(title_ids):
+    SimilarityChange.objects.bulk_create(
+        SimilarityChange(title_id=title_id) for title_id in set(title_ids)
+    )
+
+
+def pending_changes():
+    last = SimilarityChange.objects.aggregate(last=Max('pk'))['last'] or 0
+    return last, set(
+        SimilarityChange.objects.filter(pk__lte=last).values_list(
+            'title_id', flat=True
+        )
+    )
+
+
+def clear_changes(last):
+    SimilarityChange.objects.filter(pk__lte=last).delete()
+
+
+def refresh_index(path=None):
+    path = path or settings.SIMILAR_TITLES_INDEX
+    index = SimilarityIndex(path)
+    built_at = datetime.fromtimestamp(index.built_at, tz=timezone.utc)
+    last_change, changed = pending_changes()
+    changed.update(
+        Review.objects.filter(
+            pub_date__gte=built_at
+        ).values_list('title_id', flat=True)
+    )
+    title_ids, matrix = load_features()
+    changed = np.fromiter(changed, dtype=np.int64, count=len(changed))
+    removed = np.setdiff1d(index.ids, title_ids)
+    positions = np.searchsorted(index.ids, title_ids)
+    known = positions < len(index.ids)
+    known[known] = index.ids[positions[known]] == title_ids[known]
+    if not changed.size and not removed.size and known.all():
+        return 0
+    affected = related_titles(
+        matrix, np.flatnonzero(np.isin(title_ids, changed))
+    )
+    affected[~known] = True
+    neighbors = np.zeros((len(title_ids), index.k), dtype=np.int64)
+    scores = np.zeros((len(title_ids), index.k), dtype=np.float32)
+    neighbors[known] = index.neighbor_ids[positions[known]]
+    scores[known] = index.scores[positions[known]]
+    affected |= np.isin(
+        neighbors, np.concatenate((changed, removed))
+    ).any(axis=1)
+    positions = np.flatnonzero(affected)
+    neighbors[positions], scores[positions] = build_rows(
+        title_ids, matrix, positions, index.k
+    )
+    write_index(path, title_ids, neighbors, scores, index.k)
+    clear_changes(last_change)
+    return len(positions)
+
+
+class SimilarityIndex:
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as index_file:
+            self.stat = os.fstat(index_file.fileno())
+            self.buffer = np.memmap(index_file, dtype=np.uint8, mode='r')
+        magic, _, self.k, count, built_at = HEADER.unpack(
+            self.buffer[:HEADER.size].tobytes()
+        )
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a similarity index')
+        self.built_at = built_at
+        self.offset = HEADER.size
+        self.ids = self.take(count, '<i8')
+        self.neighbor_ids = self.take(count * self.k, '<i8').reshape(
+            count, self.k
+        )
+        self.scores = self.take(count * self.k, '<f4').reshape(
+            count, self.k
+        )
+
+    def take(self, count, dtype):
+        size = count * np.dtype(dtype).itemsize
+        chunk = self.buffer[self.offset:self.offset + size].view(dtype)
+        self.offset += size
+        return chunk
+
+    def neighbors(self, title_id, with_scores=False):
+        position = int(np.searchsorted(self.ids, title_id))
+        if position == len(self.ids) or self.ids[position] != title_id:
+            return None
+        row = self.neighbor_ids[position]
+        count = int(np.count_nonzero(row))
+        result = row[:count].tolist()
+        if with_scores:
+            return list(zip(result, self.scores[position, :count].tolist()))
+        return result
+
+    def is_stale(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return (stat.st_ino, stat.st_mtime_ns) != (
+            self.stat.st_ino, self.stat.st_mtime_ns
+        )
+
+
+_index = None
+
+
+def get_index():
+    global _index
+    if _index is None or _index.is_stale():
+        try:
+            _index = SimilarityIndex(settings.SIMILAR_TITLES_INDEX)
+        except FileNotFoundError:
+            _index = None
+    return _index
@@ -0,0 +1,187 @@
+import io
+import json
+import re
+import zipfile
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .catalog import bump_version
+
+MANIFEST = 'manifest.json'
+BATCH_SIZE = 5000
+ESCAPES = {
+    '\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r',
+    '\b': '\\b', '\f': '\\f', '\v': '\\v',
+}
+UNESCAPES = {value[1]: key for key, value in ESCAPES.items()}
+ESCAPE = re.compile(r'[\\\t\n\r\b\f\v]')
+UNESCAPE = re.compile(r'\\(.)')
+
+
+def snapshot_models():
+    pending = [
+        model for model in apps.get_app_config('reviews').get_models(
+            include_auto_created=True
+        )
+        if model._meta.managed and not model._meta.proxy
+    ]
+    if apps.is_installed('django.contrib.admin'):
+        pending.append(apps.get_model('admin', 'LogEntry'))
+    ordered = []
+    while pending:
+        for model in pending:
+            related = {
+                field.related_model
+                for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model is not model
+            }
+            if not related & set(pending):
+                ordered.append(model)
+                pending.remove(model)
+                break
+        else:
+            raise ValueError(f'Circular foreign keys between {pending}')
+    return ordered
+
+
+def columns(model):
+    return ', '.join(
+        connection.ops.quote_name(field.column)
+        for field in model._meta.concrete_fields
+    )
+
+
+def encode(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return ESCAPE.sub(lambda match: ESCAPES[match.group()], str(value))
+
+
+def decode(value):
+    if value == '\\N':
+        return None
+    return UNESCAPE.sub(lambda match: UNESCAPES[match.group(1)], value)
+
+
+def dump_table(model, stream):
+    table = connection.ops.quote_name(model._meta.db_table)
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f'COPY {table} ({columns(model)}) TO STDOUT', stream
+            )
+            return cursor.rowcount
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='\n')
+    count = 0
+    rows = model.objects.order_by('pk').values_list(*(
+        field.attname for field in model._meta.concrete_fields
+    ))
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        text.write('\t'.join(encode(value) for value in row) + '\n')
+        count += 1
+    text.flush()
+    text.detach()
+    return count
+
+
+def load_table(model, stream):
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.cursor.copy_expert(
+                f'COPY {table} ({columns(model)}) FROM STDIN', stream
+            )
+            return cursor.rowcount
+        fields = model._meta.concrete_fields
+        sql = (
+            f'INSERT INTO {table} ({columns(model)}) '
+            f'VALUES ({", ".join(["%s"] * len(fields))})'
+        )
+        batch, count = [], 0
+        for line in io.TextIOWrapper(stream, encoding='utf-8', newline='\n'):
+            batch.append([
+                field.get_db_prep_save(
+                    field.to_python(decode(value)), connection
+                )
+                for field, value in zip(fields, line.rstrip('\n').split('\t'))
+            ])
+            if len(batch) == BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                count, batch = count + len(batch), []
+        cursor.executemany(sql, batch)
+        return count + len(batch)
+
+
+def snapshot(path):
+    tables = []
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ'
+                    )
+            for model in snapshot_models():
+                name = f'{model._meta.db_table}.tsv'
+                with archive.open(name, 'w', force_zip64=True) as data:
+                    rows = dump_table(model, data)
+                tables.append({
+                    'model': model._meta.label,
+                    'table': model._meta.db_table,
+                    'columns': [
+                        field.column for field in model._meta.concrete_fields
+                    ],
+                    'rows': rows,
+                })
+        archive.writestr(MANIFEST, json.dumps({
+            'created': timezone.now().isoformat(),
+            'vendor': connection.vendor,
+            'tables': tables,
+        }, indent=2))
+    return tables
+
+
+def check_manifest(manifest, models):
+    expected = [
+        {
+            'model': model._meta.label,
+            'table': model._meta.db_table,
+            'columns': [field.column for field in model._meta.concrete_fields],
+        }
+        for model in models
+    ]
+    found = [
+        {key: table[key] for key in ('model', 'table', 'columns')}
+        for table in manifest['tables']
+    ]
+    if sorted(found, key=str) != sorted(expected, key=str):
+        raise ValueError('Snapshot does not match the current schema')
+
+
+def restore(path):
+    models = snapshot_models()
+    counts = []
+    with zipfile.ZipFile(path) as archive:
+        check_manifest(json.loads(archive.read(MANIFEST)), models)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sql_flush(
+                    no_style(),
+                    [model._meta.db_table for model in models],
+                    [],
+                ):
+                    cursor.execute(sql)
+                for model in models:
+                    with archive.open(f'{model._meta.db_table}.tsv') as data:
+                        counts.append((model, load_table(model, data)))
+                for sql in connection.ops.sequence_reset_sql(
+                    no_style(), models
+                ):
+                    cursor.execute(sql)
+            bump_version()
+    return counts
@@ -0,0 +1,25 @@
+from django.db import router
+from django.db.models import F
+from django.db.models.signals import post_save
+
+
+def save_changes(instance, fields, version):
+    model = type(instance)
+    updated = model._default_manager.filter(
+        pk=instance.pk, version=version
+    ).update(
+        version=F('version') + 1,
+        **{field: getattr(instance, field) for field in fields}
+    )
+    if not updated:
+        return False
+    instance.version = version + 1
+    post_save.send(
+        sender=model,
+        instance=instance,
+        created=False,
+        update_fields=frozenset(fields),
+        raw=False,
+        using=router.db_for_write(model, instance=instance),
+    )
+    return True
@@ -1,5 +1,9 @@
+import os
 import sys
 from os.path import abspath, dirname, join
+from threading import local
+
+import pytest
 
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
@@ -7,3 +11,101 @@ infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings():
+    if 'DB_ENGINE' in os.environ:
+        return
+    from django.db import connections
+    connections.databases = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+    }
+    connections._connections = local()
+
+
+@pytest.fixture(autouse=True)
+def query_budgets(settings):
+    settings.QUERY_INSPECTOR_RAISE = True
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='reader', email='reader@yamdb.fake'
+    )
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='boss', email='boss@yamdb.fake', role='admin'
+    )
+
+
+def client_for(user=None):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = APIClient()
+    if user is not None:
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.fixture
+def anon_client():
+    return client_for()
+
+
+@pytest.fixture
+def user_client(user):
+    return client_for(user)
+
+
+@pytest.fixture
+def admin_client(admin):
+    return client_for(admin)
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    category = Category.objects.create(name='Книги', slug='books')
+    genres = [
+        Genre.objects.create(name=name, slug=slug)
+        for name, slug in (('Драма', 'drama'), ('Комедия', 'comedy'))
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{number}', email=f'author{number}@yamdb.fake'
+        )
+        for number in range(3)
+    ]
+    titles = []
+    for number in range(3):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000 + number,
+            category=category,
+        )
+        title.genre.set(genres)
+        titles.append(title)
+        for author in authors:
+            review = Review.objects.create(
+                title=title, author=author, text='Отзыв', score=number + 5
+            )
+            for commenter in authors:
+                Comment.objects.create(
+                    review=review, author=commenter, text='Комментарий'
+                )
+    return titles
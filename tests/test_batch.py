@@ -0,0 +1,102 @@
+import pytest
+
+LIST_URLS = (
+    '/api/v1/titles/?x=1',
+    '/api/v1/titles/{title}/reviews/?x=1',
+    '/api/v1/titles/{title}/reviews/{review}/comments/?x=1',
+)
+
+
+@pytest.mark.django_db
+class TestBatch:
+
+    @pytest.mark.parametrize('url', LIST_URLS)
+    def test_fragment_cached_list(self, anon_client, catalog, url):
+        title = catalog[0]
+        url = url.format(title=title.pk, review=title.reviews.first().pk)
+        expected = anon_client.get(url).json()
+        response = anon_client.post(
+            '/api/v1/batch/', [{'method': 'GET', 'path': url}], format='json'
+        )
+        assert response.status_code == 200
+        assert response.json() == [{'status': 200, 'body': expected}], (
+            'Проверьте, что batch возвращает тело списка из кеша фрагментов'
+        )
+
+    def batch(self, client, items):
+        return client.post('/api/v1/batch/', items, format='json')
+
+    def test_item_statuses(self, anon_client, catalog):
+        response = self.batch(anon_client, [
+            {'method': 'GET', 'path': '/api/v1/missing/'},
+            {'method': 'GET', 'path': '/admin/'},
+            {'method': 'POST', 'path': '/api/v1/batch/'},
+            {'method': 'GET', 'path': f'/api/v1/titles/{catalog[0].pk}/events/'},
+            {'method': 'DELETE', 'path': f'/api/v1/titles/{catalog[0].pk}/'},
+            {'method': 'GET', 'path': '/api/v1/titles/0/'},
+        ])
+        assert response.status_code == 200
+        assert [item['status'] for item in response.json()] == [
+            404, 400, 400, 400, 401, 404
+        ], 'Проверьте статусы отдельных запросов в batch'
+        assert response.json()[1]['body'] == {
+            'detail': 'Path is not batchable.'
+        }
+
+    def test_item_limits(self, anon_client, settings):
+        item = {'method': 'GET', 'path': '/api/v1/genres/'}
+        response = self.batch(anon_client, [])
+        assert response.status_code == 400
+        settings.BATCH_MAX_ITEMS = 2
+        response = self.batch(anon_client, [item] * 3)
+        assert response.status_code == 400, (
+            'Проверьте, что batch ограничивает число запросов'
+        )
+        settings.BATCH_MAX_SIZE = 50
+        response = self.batch(anon_client, [item] * 2)
+        assert response.status_code == 413, (
+            'Проверьте, что batch ограничивает размер тела'
+        )
+
+    def test_failed_item_is_isolated(self, user_client, catalog,
+                                     monkeypatch):
+        from api.views import ReviewViewSet
+        from django.db import IntegrityError
+
+        def fail(self, serializer):
+            raise IntegrityError('duplicate key')
+
+        monkeypatch.setattr(ReviewViewSet, 'perform_create', fail)
+        title = catalog[0]
+        review = title.reviews.first()
+        response = self.batch(user_client, [
+            {'method': 'POST', 'path': f'/api/v1/titles/{title.pk}/reviews/',
+             'body': {'text': 'Отзыв', 'score': 5}},
+            {'method': 'POST',
+             'path': f'/api/v1/titles/{title.pk}/reviews/{review.pk}/'
+                     'comments/',
+             'body': {'text': 'После ошибки'}},
+        ])
+        assert response.status_code == 200
+        statuses = [item['status'] for item in response.json()]
+        assert statuses == [500, 201], (
+            'Проверьте, что ошибка одного запроса не ломает остальные'
+        )
+        assert response.json()[0]['body'] == {
+            'detail': 'Internal server error.'
+        }
+        assert review.comments.filter(text='После ошибки').exists()
+
+    def test_failed_reads_in_pool(self, anon_client, monkeypatch):
+        from api.views import GenreViewSet
+
+        def fail(self, request, *args, **kwargs):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(GenreViewSet, 'list', fail)
+        item = {'method': 'GET', 'path': '/api/v1/genres/'}
+        response = self.batch(anon_client, [item] * 3)
+        assert response.status_code == 200
+        assert [item['status'] for item in response.json()] == [500] * 3, (
+            'Проверьте, что ошибки параллельных GET возвращаются как 500'
+        )
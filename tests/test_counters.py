@@ -0,0 +1,102 @@
+import pytest
+
+
+def counters():
+    from reviews.models import Review, Title
+
+    return (
+        dict(Title.objects.values_list('pk', 'reviews_count')),
+        dict(Review.objects.values_list('pk', 'comments_count')),
+    )
+
+
+def recounted():
+    from reviews.counters import recount
+
+    recount()
+    return counters()
+
+
+@pytest.mark.django_db
+class TestCounters:
+
+    def reviews_url(self, title):
+        return f'/api/v1/titles/{title.pk}/reviews/'
+
+    def comments_url(self, review):
+        return f'{self.reviews_url(review.title)}{review.pk}/comments/'
+
+    def test_review_create_and_delete(self, user_client, admin_client,
+                                      catalog):
+        title = catalog[0]
+        response = user_client.post(
+            self.reviews_url(title), {'text': 'Новый', 'score': 5}
+        )
+        assert response.status_code == 201
+        title.refresh_from_db()
+        assert title.reviews_count == 4, (
+            'Проверьте, что создание отзыва увеличивает reviews_count'
+        )
+        review = title.reviews.exclude(pk=response.json()['id']).first()
+        response = admin_client.delete(
+            f'{self.reviews_url(title)}{review.pk}/'
+        )
+        assert response.status_code == 204
+        title.refresh_from_db()
+        assert title.reviews_count == 3, (
+            'Проверьте, что удаление отзыва уменьшает reviews_count'
+        )
+        assert counters() == recounted()
+
+    def test_comment_create_and_delete(self, user_client, admin_client,
+                                       catalog):
+        review = catalog[0].reviews.first()
+        response = user_client.post(
+            self.comments_url(review), {'text': 'Новый'}
+        )
+        assert response.status_code == 201
+        review.refresh_from_db()
+        assert review.comments_count == 4, (
+            'Проверьте, что создание комментария увеличивает comments_count'
+        )
+        response = admin_client.delete(
+            f'{self.comments_url(review)}{response.json()["id"]}/'
+        )
+        assert response.status_code == 204
+        admin_client.delete(
+            f'{self.comments_url(review)}{review.comments.first().pk}/'
+        )
+        review.refresh_from_db()
+        assert review.comments_count == 2, (
+            'Проверьте, что удаление комментария уменьшает comments_count'
+        )
+        assert counters() == recounted()
+
+    def test_user_cascade(self, catalog, django_user_model):
+        django_user_model.objects.get(username='author0').delete()
+        titles, reviews = counters()
+        assert set(titles.values()) == {2}, (
+            'Проверьте, что удаление автора уменьшает reviews_count'
+        )
+        assert set(reviews.values()) == {2}, (
+            'Проверьте, что удаление автора уменьшает comments_count'
+        )
+        assert (titles, reviews) == recounted()
+
+    def test_title_cascade(self, catalog):
+        catalog[0].delete()
+        titles, reviews = counters()
+        assert titles == {title.pk: 3 for title in catalog[1:]}
+        assert len(reviews) == 6 and set(reviews.values()) == {3}
+        assert (titles, reviews) == recounted()
+
+    def test_review_cascade(self, catalog):
+        title = catalog[0]
+        title.reviews.first().delete()
+        titles, reviews = counters()
+        assert titles[title.pk] == 2, (
+            'Проверьте, что удаление отзыва с комментариями '
+            'уменьшает reviews_count'
+        )
+        assert len(reviews) == 8 and set(reviews.values()) == {3}
+        assert (titles, reviews) == recounted()
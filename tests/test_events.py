@@ -0,0 +1,139 @@
+import pytest
+
+CHANNEL = 'title-1'
+
+
+@pytest.fixture
+def broker(settings, monkeypatch):
+    from api import events
+
+    settings.EVENTS_BROKER = 'api.events.InMemoryBroker'
+    settings.EVENTS_BUFFER_SIZE = 3
+    settings.EVENTS_HISTORY_SIZE = 10
+    monkeypatch.setattr(events, '_broker', None)
+    return events.get_broker()
+
+
+def publish(broker, count, channel=CHANNEL):
+    for number in range(count):
+        broker.publish(channel, 'review.created', {'id': number})
+
+
+def ids(events):
+    return [event.id for event in events]
+
+
+class TestInMemoryBroker:
+
+    def test_replay(self, broker):
+        publish(broker, 3)
+        publish(broker, 2, channel='title-2')
+        publish(broker, 2)
+        subscription = broker.subscribe(CHANNEL, last_event_id=2)
+        assert ids(subscription.drain()) == [3, 6, 7], (
+            'Проверьте, что подписка с Last-Event-ID получает пропущенные '
+            'события своего канала'
+        )
+
+    def test_live_order_and_dedupe(self, broker):
+        from queue import Empty
+
+        publish(broker, 2)
+        subscription = broker.subscribe(CHANNEL, last_event_id=0)
+        publish(broker, 1)
+        received = [subscription.get(timeout=0) for _ in range(3)]
+        assert ids(received) == [1, 2, 3]
+        broker.hub.dispatch(received[1])
+        publish(broker, 1)
+        assert subscription.get(timeout=0).id == 4, (
+            'Проверьте, что повторно доставленное событие отбрасывается'
+        )
+        with pytest.raises(Empty):
+            subscription.get(timeout=0)
+        subscription.close()
+        assert not broker.hub.subscriptions
+
+    def test_overflow_then_resume(self, broker):
+        from api.views import event_stream
+
+        subscription = broker.subscribe(CHANNEL)
+        publish(broker, 5)
+        assert subscription.overflowed
+        frames = list(event_stream(subscription))
+        assert frames[0].startswith('retry: ')
+        received = [int(frame.split('\n')[0][4:]) for frame in frames[1:]]
+        assert received == [1, 2, 3], (
+            'Проверьте, что переполненный поток отдаёт буфер и закрывается'
+        )
+        assert not broker.hub.subscriptions
+        resumed = broker.subscribe(CHANNEL, last_event_id=received[-1])
+        assert ids(resumed.drain()) == [4, 5], (
+            'Проверьте, что после переполнения клиент догоняет события '
+            'по Last-Event-ID'
+        )
+
+    def test_replay_overflow_is_truncated(self, broker):
+        publish(broker, 5)
+        subscription = broker.subscribe(CHANNEL, last_event_id=0)
+        assert subscription.overflowed
+        assert ids(subscription.drain()) == [1, 2, 3]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPublish:
+
+    def test_publish_on_commit(self, broker):
+        from api.events import publish as publish_on_commit
+        from django.db import transaction
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                publish_on_commit(CHANNEL, 'review.created', {'id': 1})
+                raise RuntimeError
+        with transaction.atomic():
+            publish_on_commit(CHANNEL, 'review.created', {'id': 2})
+            assert broker.replay(CHANNEL, 0) == [], (
+                'Проверьте, что событие публикуется только после коммита'
+            )
+        assert [event.data for event in broker.replay(CHANNEL, 0)] == [
+            {'id': 2}
+        ]
+
+    def test_review_events(self, broker, user_client, catalog):
+        from api.events import title_channel
+
+        title = catalog[0]
+        channel = title_channel(title.pk)
+        last_id = broker.last_id
+        response = user_client.post(
+            f'/api/v1/titles/{title.pk}/reviews/',
+            {'text': 'Новый', 'score': 5},
+        )
+        assert response.status_code == 201
+        events = broker.replay(channel, last_id)
+        assert [(event.event, event.data['id']) for event in events] == [
+            ('review.created', response.json()['id'])
+        ]
+
+    def test_last_event_id_resume(self, broker, anon_client, catalog,
+                                  settings):
+        from api.events import title_channel
+
+        settings.EVENTS_HEARTBEAT = 0.01
+        settings.EVENTS_STREAM_TIMEOUT = 0.05
+        title = catalog[0]
+        last_id = broker.last_id
+        publish(broker, 3, channel=title_channel(title.pk))
+        response = anon_client.get(
+            f'/api/v1/titles/{title.pk}/events/',
+            HTTP_LAST_EVENT_ID=str(last_id + 1),
+        )
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+        body = b''.join(response.streaming_content).decode()
+        assert [
+            int(line[4:]) for line in body.split('\n')
+            if line.startswith('id: ')
+        ] == [last_id + 2, last_id + 3], (
+            'Проверьте, что поток продолжается после Last-Event-ID'
+        )
@@ -0,0 +1,67 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestGenreFilter:
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Книги', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        Genre.objects.create(name='Триллер', slug='thriller')
+        genres = {
+            'drama': [drama],
+            'comedy': [comedy],
+            'both': [drama, comedy],
+            'none': [],
+        }
+        titles = {}
+        for name, title_genres in genres.items():
+            title = Title.objects.create(
+                name=name, year=2000, category=category
+            )
+            title.genre.set(title_genres)
+            titles[name] = title.pk
+        return titles
+
+    def names(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200
+        return {title['name'] for title in response.json()['results']}
+
+    def test_any(self, anon_client, titles):
+        assert self.names(anon_client, 'genre=drama,comedy') == {
+            'drama', 'comedy', 'both'
+        }, 'Проверьте, что genre без genre_match ищет любой из жанров'
+
+    def test_all(self, anon_client, titles):
+        assert self.names(
+            anon_client, 'genre=drama,comedy&genre_match=all'
+        ) == {'both'}, (
+            'Проверьте, что genre_match=all оставляет произведения '
+            'со всеми жанрами'
+        )
+
+    def test_all_single_genre(self, anon_client, titles):
+        assert self.names(
+            anon_client, 'genre=drama&genre_match=all'
+        ) == {'drama', 'both'}
+
+    def test_all_without_matches(self, anon_client, titles):
+        assert self.names(
+            anon_client, 'genre=drama,thriller&genre_match=all'
+        ) == set()
+
+    def test_unknown_slug(self, anon_client, titles):
+        assert self.names(anon_client, 'genre=drama,missing') == {
+            'drama', 'both'
+        }
+        assert self.names(
+            anon_client, 'genre=drama,missing&genre_match=all'
+        ) == set(), (
+            'Проверьте, что неизвестный жанр при genre_match=all '
+            'возвращает пустой список'
+        )
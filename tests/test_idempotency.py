@@ -0,0 +1,101 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestIdempotency:
+
+    def url(self, title):
+        return f'/api/v1/titles/{title.pk}/reviews/'
+
+    def test_replays_created_response(self, user_client, catalog):
+        title = catalog[0]
+        data = {'text': 'Повтор', 'score': 7}
+        first = user_client.post(
+            self.url(title), data, HTTP_IDEMPOTENCY_KEY='review-1'
+        )
+        assert first.status_code == 201
+        assert 'Idempotent-Replayed' not in first
+        second = user_client.post(
+            self.url(title), data, HTTP_IDEMPOTENCY_KEY='review-1'
+        )
+        assert second.status_code == 201, (
+            'Проверьте, что повтор запроса с тем же ключом возвращает 201'
+        )
+        assert second['Idempotent-Replayed'] == 'true'
+        assert second.json() == first.json()
+        assert title.reviews.filter(text='Повтор').count() == 1, (
+            'Проверьте, что повтор запроса не создаёт второй отзыв'
+        )
+
+    def test_reused_key_with_other_body(self, user_client, catalog):
+        title = catalog[0]
+        user_client.post(
+            self.url(title), {'text': 'Первый', 'score': 7},
+            HTTP_IDEMPOTENCY_KEY='review-2',
+        )
+        response = user_client.post(
+            self.url(title), {'text': 'Другой', 'score': 3},
+            HTTP_IDEMPOTENCY_KEY='review-2',
+        )
+        assert response.status_code == 422, (
+            'Проверьте, что ключ с другим телом запроса возвращает 422'
+        )
+        assert not title.reviews.filter(text='Другой').exists()
+
+    def test_keys_are_scoped_to_user(self, user_client, admin_client,
+                                     catalog):
+        title = catalog[0]
+        data = {'text': 'Свой ключ', 'score': 5}
+        user_client.post(self.url(title), data, HTTP_IDEMPOTENCY_KEY='same')
+        response = admin_client.post(
+            self.url(title), data, HTTP_IDEMPOTENCY_KEY='same'
+        )
+        assert response.status_code == 201
+        assert 'Idempotent-Replayed' not in response
+        assert title.reviews.filter(text='Свой ключ').count() == 2
+
+    def signup(self, client, address):
+        return client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'newcomer', 'email': 'newcomer@yamdb.fake'},
+            HTTP_IDEMPOTENCY_KEY='signup-1',
+            HTTP_X_FORWARDED_FOR=address,
+            REMOTE_ADDR='10.0.0.1',
+        )
+
+    def test_anonymous_keys_are_scoped_to_client(self, anon_client):
+        first = self.signup(anon_client, '203.0.113.1')
+        assert first.status_code == 200
+        replayed = self.signup(anon_client, '203.0.113.1')
+        assert replayed['Idempotent-Replayed'] == 'true'
+        other = self.signup(anon_client, '203.0.113.2')
+        assert 'Idempotent-Replayed' not in other, (
+            'Проверьте, что ключи анонимных запросов разделяются по адресу '
+            'клиента из X-Forwarded-For, как в ограничителях частоты'
+        )
+
+    def test_lock_outlives_handler(self, settings, monkeypatch):
+        from api import mixins
+
+        timeouts = []
+        add = mixins.cache.add
+
+        def spy(key, value, timeout=None):
+            timeouts.append(timeout)
+            return add(key, value, timeout)
+
+        monkeypatch.setattr(mixins.cache, 'add', spy)
+        settings.IDEMPOTENCY_LOCK_TIMEOUT = 0
+        token = mixins.acquire_lock('lock')
+        assert token is not None
+        assert timeouts == [settings.IDEMPOTENCY_LOCK_TTL]
+        assert settings.IDEMPOTENCY_LOCK_TTL > 30, (
+            'Проверьте, что блокировка живёт дольше таймаута воркера'
+        )
+        assert mixins.acquire_lock('lock') is None
+        mixins.release_lock('lock', 'stale')
+        assert mixins.acquire_lock('lock') is None, (
+            'Проверьте, что чужая блокировка не снимается'
+        )
+        mixins.release_lock('lock', token)
+        assert mixins.acquire_lock('lock') is not None
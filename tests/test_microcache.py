@@ -0,0 +1,46 @@
+import pytest
+
+
+def purge_jobs():
+    from jobs.models import Job
+
+    return [
+        job.arguments[0][0]
+        for job in Job.objects.filter(name='api.jobs.purge_cache')
+    ]
+
+
+@pytest.mark.django_db
+class TestMicroCache:
+
+    def test_anonymous_headers(self, anon_client, catalog):
+        response = anon_client.get(f'/api/v1/titles/{catalog[0].pk}/')
+        assert 'public' in response['Cache-Control']
+        assert 's-maxage=' in response['Cache-Control']
+        assert 'Authorization' in response['Vary']
+        assert response['Surrogate-Key'] == f'catalog title-{catalog[0].pk}'
+
+    def test_authenticated_is_private(self, user_client, catalog):
+        response = user_client.get('/api/v1/titles/')
+        assert 'private' in response['Cache-Control']
+        assert 'Surrogate-Key' not in response
+
+    def test_no_purge_without_backend(self, admin_client, catalog):
+        admin_client.patch(f'/api/v1/titles/{catalog[0].pk}/', {'year': 1})
+        assert purge_jobs() == [], (
+            'Проверьте, что без CACHE_PURGE_BACKEND задачи сброса не ставятся'
+        )
+
+    def test_write_enqueues_purge(self, admin_client, catalog, settings):
+        settings.CACHE_PURGE_BACKEND = 'api.purge.MemoryBackend'
+        title = catalog[0]
+        admin_client.patch(f'/api/v1/titles/{title.pk}/', {'year': 1})
+        assert purge_jobs() == [['titles', f'title-{title.pk}']]
+
+    def test_memory_backend_is_bounded(self, settings):
+        from api.purge import MemoryBackend
+
+        settings.CACHE_PURGE_MEMORY_SIZE = 3
+        backend = MemoryBackend()
+        backend.purge(['a', 'b', 'c', 'd', 'e'])
+        assert list(backend.purged) == ['c', 'd', 'e']
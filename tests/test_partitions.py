@@ -0,0 +1,168 @@
+import os
+from datetime import timedelta
+
+import pytest
+
+requires_postgres = pytest.mark.skipif(
+    'postgresql' not in os.getenv('DB_ENGINE', ''),
+    reason='Секционирование проверяется только на PostgreSQL',
+)
+
+
+def age_comments(review, months):
+    from django.utils import timezone
+    from reviews.partitions import month_start
+
+    old = month_start(timezone.now(), -months) + timedelta(days=3)
+    ids = list(review.comments.values_list('pk', flat=True)[:2])
+    review.comments.filter(pk__in=ids).update(pub_date=old)
+    return ids, old
+
+
+def comments_url(review):
+    return (
+        f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/'
+    )
+
+
+@pytest.mark.django_db
+class TestArchive:
+
+    def test_archive_moves_old_comments(self, catalog):
+        from reviews.models import Comment, CommentArchive
+        from reviews.partitions import archive
+
+        review = catalog[0].reviews.first()
+        ids, _ = age_comments(review, 14)
+        assert archive(12) == 2
+        assert set(
+            CommentArchive.objects.values_list('pk', flat=True)
+        ) == set(ids)
+        assert not Comment.objects.filter(pk__in=ids).exists()
+        review.refresh_from_db()
+        assert review.comments_count == 3, (
+            'Проверьте, что перенос в архив не меняет счётчик комментариев'
+        )
+
+    def test_union_read(self, anon_client, admin_client, catalog):
+        from reviews.partitions import archive
+
+        review = catalog[0].reviews.first()
+        ids, _ = age_comments(review, 14)
+        archive(12)
+        response = anon_client.get(comments_url(review))
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert len(results) == 3, (
+            'Проверьте, что список комментариев включает архивные'
+        )
+        assert {comment['id'] for comment in results[-2:]} == set(ids)
+        url = f'{comments_url(review)}{ids[0]}/'
+        response = anon_client.get(url)
+        assert response.status_code == 200
+        assert response.json()['id'] == ids[0]
+        response = admin_client.patch(url, {'text': 'Изменён'})
+        assert response.status_code == 404, (
+            'Проверьте, что архивные комментарии доступны только для чтения'
+        )
+
+
+@requires_postgres
+@pytest.mark.django_db
+class TestPartitions:
+
+    def test_convert(self, catalog):
+        from django.db import connection
+        from django.utils import timezone
+        from reviews.models import Comment
+        from reviews.partitions import (
+            convert,
+            is_partitioned,
+            month_start,
+            partitions,
+            table,
+        )
+
+        review = catalog[0].reviews.first()
+        _, old = age_comments(review, 14)
+        convert(2)
+        assert is_partitioned()
+        months = [start for start, _ in partitions()]
+        assert months[0] == month_start(old)
+        assert months[-1] == month_start(timezone.now(), 2)
+        assert len(months) == 17
+        assert Comment.objects.count() == 27
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT indexname FROM pg_indexes WHERE tablename = %s',
+                [table()]
+            )
+            indexes = {name for name, in cursor.fetchall()}
+        assert {index.name for index in Comment._meta.indexes} <= indexes, (
+            'Проверьте, что индексы модели сохраняются после секционирования'
+        )
+
+    def test_create_future_partitions(self, catalog):
+        from django.utils import timezone
+        from reviews.partitions import (
+            convert,
+            create_partitions,
+            month_start,
+            partition_name,
+        )
+
+        convert(0)
+        now = timezone.now()
+        assert create_partitions(2) == [
+            partition_name(month_start(now, 1)),
+            partition_name(month_start(now, 2)),
+        ]
+        assert create_partitions(2) == []
+
+    def test_archive_detaches_partitions(self, catalog):
+        from django.db import connection
+        from django.utils import timezone
+        from reviews.models import Comment, CommentArchive
+        from reviews.partitions import (
+            archive,
+            convert,
+            month_start,
+            partition_name,
+            partitions,
+        )
+
+        review = catalog[0].reviews.first()
+        ids, old = age_comments(review, 14)
+        convert(1)
+        assert archive(12) == 2
+        cutoff = month_start(timezone.now(), -12)
+        assert all(month_start(start, 1) > cutoff for start, _ in partitions())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT to_regclass(%s)', [partition_name(month_start(old))]
+            )
+            assert cursor.fetchone()[0] is None, (
+                'Проверьте, что опустевшая секция удаляется'
+            )
+            cursor.execute(
+                'SELECT reloptions FROM pg_class WHERE oid = to_regclass(%s)',
+                [CommentArchive._meta.db_table]
+            )
+            assert 'toast_tuple_target=128' in cursor.fetchone()[0]
+        assert set(
+            CommentArchive.objects.values_list('pk', flat=True)
+        ) == set(ids)
+        assert Comment.objects.count() == 25
+
+    def test_union_read(self, anon_client, catalog):
+        from reviews.partitions import archive, convert
+
+        review = catalog[0].reviews.first()
+        ids, _ = age_comments(review, 14)
+        convert(1)
+        archive(12)
+        response = anon_client.get(comments_url(review))
+        assert response.status_code == 200
+        assert {comment['id'] for comment in response.json()['results']} == (
+            set(review.comments.values_list('pk', flat=True)) | set(ids)
+        )
@@ -0,0 +1,45 @@
+import pytest
+
+BUDGETED_URLS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?genre=drama,comedy&genre_match=all',
+    '/api/v1/titles/?ordering=-reviews_count',
+    '/api/v1/titles/{title}/',
+    '/api/v1/titles/{title}/?include=stats',
+    '/api/v1/titles/{title}/?include=reviews.comments',
+    '/api/v1/titles/{title}/stats/',
+    '/api/v1/titles/{title}/similar/',
+    '/api/v1/titles/{title}/reviews/',
+    '/api/v1/titles/{title}/reviews/?ordering=-comments_count',
+    '/api/v1/titles/{title}/reviews/{review}/',
+    '/api/v1/titles/{title}/reviews/{review}/comments/',
+    '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/',
+)
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+
+    @pytest.mark.parametrize('url', BUDGETED_URLS)
+    def test_within_budget(self, anon_client, catalog, url):
+        title = catalog[0]
+        review = title.reviews.first()
+        url = url.format(
+            title=title.pk,
+            review=review.pk,
+            comment=review.comments.first().pk,
+        )
+        for attempt in ('cold', 'warm'):
+            response = anon_client.get(url)
+            assert response.status_code == 200, (
+                f'Проверьте, что {url} отвечает 200 ({attempt} cache)'
+            )
+
+    def test_budget_exceeded_fails(self, anon_client, catalog, settings,
+                                   monkeypatch):
+        from api.inspector import QueryBudgetError
+        from api.views import TitleViewSet
+
+        monkeypatch.setattr(TitleViewSet, 'query_budget', {'list': 1})
+        with pytest.raises(QueryBudgetError):
+            anon_client.get('/api/v1/titles/')
@@ -0,0 +1,150 @@
+import pytest
+
+
+@pytest.fixture
+def index_path(tmp_path, settings, monkeypatch):
+    from reviews import similarity
+
+    path = str(tmp_path / 'similar_titles.idx')
+    settings.SIMILAR_TITLES_INDEX = path
+    monkeypatch.setattr(similarity, '_index', None)
+    return path
+
+
+@pytest.fixture
+def extra_titles(catalog):
+    from reviews.models import Genre, Title
+
+    thriller = Genre.objects.create(name='Триллер', slug='thriller')
+    half = Title.objects.create(
+        name='Только драма', year=2010, category=catalog[0].category
+    )
+    half.genre.set(Genre.objects.filter(slug='drama'))
+    loner = Title.objects.create(
+        name='Одиночка', year=2011, category=catalog[0].category
+    )
+    loner.genre.set([thriller])
+    return half, loner
+
+
+def rows(index):
+    return {
+        int(title_id): sorted(
+            round(score, 5)
+            for _, score in index.neighbors(int(title_id), with_scores=True)
+        )
+        for title_id in index.ids
+    }
+
+
+@pytest.mark.django_db
+class TestSimilarity:
+
+    def test_index_format(self, catalog, index_path):
+        import numpy as np
+        from reviews.similarity import HEADER, MAGIC, build_index
+
+        assert build_index(k=2) == 3
+        with open(index_path, 'rb') as index_file:
+            data = index_file.read()
+        magic, version, k, count, built_at = HEADER.unpack_from(data)
+        assert (magic, version, k, count) == (MAGIC, 1, 2, 3)
+        assert built_at > 0
+        assert len(data) == HEADER.size + count * 8 + count * k * (8 + 4), (
+            'Проверьте формат индекса: заголовок, id, соседи int64 '
+            'и оценки float32'
+        )
+        ids = np.frombuffer(data, '<i8', count, HEADER.size)
+        assert ids.tolist() == sorted(title.pk for title in catalog)
+        neighbors = np.frombuffer(
+            data, '<i8', count * k, HEADER.size + count * 8
+        ).reshape(count, k)
+        scores = np.frombuffer(
+            data, '<f4', count * k, HEADER.size + count * 8 * (k + 1)
+        ).reshape(count, k)
+        assert set(neighbors[0]) == {catalog[1].pk, catalog[2].pk}
+        assert np.allclose(scores, 1)
+
+    def test_neighbors_are_ranked(self, catalog, extra_titles, index_path):
+        from reviews.similarity import build_index, get_index
+
+        half, loner = extra_titles
+        build_index(k=4)
+        index = get_index()
+        neighbors = index.neighbors(catalog[0].pk, with_scores=True)
+        assert {title_id for title_id, _ in neighbors[:2]} == {
+            catalog[1].pk, catalog[2].pk
+        }
+        assert neighbors[2][0] == half.pk, (
+            'Проверьте, что соседи отсортированы по убыванию сходства'
+        )
+        assert neighbors[2][1] == pytest.approx(0.5 * 2 ** -0.5)
+        assert len(neighbors) == 3
+        assert index.neighbors(loner.pk) == [], (
+            'Проверьте, что произведение без общих признаков '
+            'не получает соседей'
+        )
+        assert index.neighbors(0) is None
+
+    def test_refresh_matches_rebuild(self, catalog, extra_titles,
+                                     index_path, tmp_path,
+                                     django_user_model):
+        from reviews.models import Genre, Review, Title
+        from reviews.similarity import (
+            SimilarityIndex,
+            build_index,
+            refresh_index,
+        )
+
+        half, loner = extra_titles
+        build_index(k=3)
+        assert refresh_index() == 0, (
+            'Проверьте, что обновление без изменений ничего не пересчитывает'
+        )
+        Review.objects.create(
+            title=loner, author=django_user_model.objects.first(),
+            text='Отзыв', score=9,
+        )
+        review = catalog[0].reviews.first()
+        review.score = 1
+        review.save()
+        catalog[1].genre.set(Genre.objects.filter(slug='thriller'))
+        catalog[2].delete()
+        new = Title.objects.create(
+            name='Новое', year=2020, category=catalog[0].category
+        )
+        new.genre.set(Genre.objects.filter(slug='comedy'))
+        assert refresh_index() > 0
+        refreshed = SimilarityIndex(index_path)
+        full_path = str(tmp_path / 'full.idx')
+        build_index(full_path, k=3)
+        assert rows(refreshed) == rows(SimilarityIndex(full_path)), (
+            'Проверьте, что частичное обновление индекса совпадает '
+            'с полной пересборкой'
+        )
+        assert catalog[2].pk not in refreshed.ids.tolist()
+        assert refreshed.neighbors(new.pk) is not None
+
+    def test_similar_endpoint(self, anon_client, catalog, extra_titles,
+                              index_path):
+        from reviews.models import Title
+        from reviews.similarity import build_index
+
+        half, loner = extra_titles
+        build_index(k=3)
+        response = anon_client.get(f'/api/v1/titles/{half.pk}/similar/')
+        assert response.status_code == 200
+        assert {title['id'] for title in response.json()} == {
+            title.pk for title in catalog
+        }, 'Проверьте, что /similar/ отдаёт соседей из индекса'
+        assert set(response.json()[0]) >= {'id', 'name', 'genre', 'rating'}
+        response = anon_client.get(f'/api/v1/titles/{loner.pk}/similar/')
+        assert response.json() == []
+        new = Title.objects.create(
+            name='Новое', year=2020, category=catalog[0].category
+        )
+        response = anon_client.get(f'/api/v1/titles/{new.pk}/similar/')
+        assert response.status_code == 200
+        assert response.json() == []
+        response = anon_client.get(f'/api/v1/titles/{new.pk + 1}/similar/')
+        assert response.status_code == 404
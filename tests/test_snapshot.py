@@ -0,0 +1,84 @@
+import pytest
+
+
+def table_state():
+    from reviews.models import Comment, Review, Title
+    from reviews.snapshot import snapshot_models
+
+    return {
+        'rows': {
+            model._meta.label: model.objects.count()
+            for model in snapshot_models()
+        },
+        'reviews_count': dict(
+            Title.objects.values_list('pk', 'reviews_count')
+        ),
+        'comments_count': dict(
+            Review.objects.values_list('pk', 'comments_count')
+        ),
+        'review_dates': dict(Review.objects.values_list('pk', 'pub_date')),
+        'comment_dates': dict(Comment.objects.values_list('pk', 'pub_date')),
+    }
+
+
+@pytest.mark.django_db
+class TestSnapshot:
+
+    def test_round_trip(self, catalog, tmp_path, django_user_model):
+        from reviews.models import Category, Comment, Genre, Title
+        from reviews.snapshot import restore, snapshot
+
+        path = str(tmp_path / 'snapshot.zip')
+        before = table_state()
+        assert sum(before['rows'].values()) > 0
+        tables = snapshot(path)
+        assert {table['model']: table['rows'] for table in tables} == (
+            before['rows']
+        )
+        django_user_model.objects.all().delete()
+        Title.objects.all().delete()
+        Genre.objects.all().delete()
+        Category.objects.all().delete()
+        assert not Comment.objects.exists()
+        counts = restore(path)
+        assert {
+            model._meta.label: rows for model, rows in counts
+        } == before['rows']
+        after = table_state()
+        for key in before:
+            assert after[key] == before[key], (
+                f'Проверьте, что восстановление из снимка сохраняет {key}'
+            )
+        review = catalog[0].reviews.first()
+        comment = Comment.objects.create(
+            review=review, author=review.author, text='После восстановления'
+        )
+        assert comment.pk > max(before['comment_dates']), (
+            'Проверьте, что после восстановления id продолжают '
+            'последовательность'
+        )
+
+    def test_schema_mismatch(self, catalog, tmp_path):
+        import json
+        import zipfile
+
+        from reviews.models import Comment
+        from reviews.snapshot import MANIFEST, restore, snapshot
+
+        path = tmp_path / 'snapshot.zip'
+        snapshot(str(path))
+        with zipfile.ZipFile(path) as archive:
+            files = {
+                name: archive.read(name) for name in archive.namelist()
+            }
+        manifest = json.loads(files[MANIFEST])
+        manifest['tables'][0]['columns'].append('missing')
+        files[MANIFEST] = json.dumps(manifest)
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name, data in files.items():
+                archive.writestr(name, data)
+        with pytest.raises(ValueError):
+            restore(str(path))
+        assert Comment.objects.count() == 27, (
+            'Проверьте, что снимок другой схемы не затирает данные'
+        )
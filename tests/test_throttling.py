@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from api import throttling
+
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(
+        throttling, 'time', SimpleNamespace(time=lambda: now.value)
+    )
+    return now
+
+
+@pytest.fixture
+def rates(settings):
+
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+                **rates,
+            },
+        }
+
+    return set_rates
+
+
+@pytest.mark.django_db
+class TestThrottling:
+    url = '/api/v1/genres/'
+
+    def statuses(self, client, count, **headers):
+        return [client.get(self.url, **headers).status_code
+                for _ in range(count)]
+
+    def test_bucket_runs_out(self, anon_client, clock, rates):
+        rates(anon='3/min')
+        assert self.statuses(anon_client, 3) == [200] * 3
+        response = anon_client.get(self.url)
+        assert response.status_code == 429, (
+            'Проверьте, что после исчерпания корзины API отвечает 429'
+        )
+        assert response['Retry-After'] == '20', (
+            'Проверьте, что Retry-After равен времени до следующего токена'
+        )
+
+    def test_bucket_refills(self, anon_client, clock, rates):
+        rates(anon='3/min')
+        self.statuses(anon_client, 4)
+        clock.value += 19
+        assert anon_client.get(self.url).status_code == 429
+        clock.value += 1
+        assert self.statuses(anon_client, 2) == [200, 429], (
+            'Проверьте, что корзина пополняется на один токен за интервал'
+        )
+        clock.value += 60
+        assert self.statuses(anon_client, 4) == [200] * 3 + [429], (
+            'Проверьте, что за период корзина пополняется полностью'
+        )
+
+    def test_clients_have_own_buckets(self, anon_client, user_client,
+                                      clock, rates):
+        rates(anon='2/min', user='3/min')
+        assert self.statuses(
+            anon_client, 3, HTTP_X_FORWARDED_FOR='203.0.113.1'
+        ) == [200, 200, 429]
+        assert self.statuses(
+            anon_client, 2, HTTP_X_FORWARDED_FOR='203.0.113.2'
+        ) == [200, 200], (
+            'Проверьте, что анонимные клиенты различаются по X-Forwarded-For'
+        )
+        assert self.statuses(user_client, 4) == [200] * 3 + [429]
@@ -0,0 +1,95 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestVersioning:
+
+    def url(self, title):
+        return f'/api/v1/titles/{title.pk}/'
+
+    def test_etag_is_version(self, anon_client, catalog):
+        title = catalog[0]
+        response = anon_client.get(self.url(title))
+        assert response['ETag'] == f'"{title.version}"', (
+            'Проверьте, что ETag произведения содержит его версию'
+        )
+
+    def test_update_bumps_version(self, admin_client, catalog):
+        title = catalog[0]
+        response = admin_client.patch(
+            self.url(title), {'name': 'Новое имя'},
+            HTTP_IF_MATCH=f'"{title.version}"',
+        )
+        assert response.status_code == 200
+        assert response['ETag'] == f'"{title.version + 1}"'
+        title.refresh_from_db()
+        assert title.name == 'Новое имя'
+        assert response.json()['version'] == title.version
+
+    def test_stale_if_match_is_rejected(self, admin_client, catalog):
+        title = catalog[0]
+        stale = f'"{title.version}"'
+        admin_client.patch(self.url(title), {'year': 1999}, HTTP_IF_MATCH=stale)
+        response = admin_client.patch(
+            self.url(title), {'year': 1998}, HTTP_IF_MATCH=stale
+        )
+        assert response.status_code == 412, (
+            'Проверьте, что изменение с устаревшим If-Match возвращает 412'
+        )
+        title.refresh_from_db()
+        assert title.year == 1999
+
+    def test_stale_if_match_on_delete(self, admin_client, catalog):
+        title = catalog[0]
+        response = admin_client.delete(
+            self.url(title), HTTP_IF_MATCH=f'"{title.version + 1}"'
+        )
+        assert response.status_code == 412
+        assert type(title).objects.filter(pk=title.pk).exists()
+
+    def test_noop_patch_keeps_version(self, admin_client, catalog):
+        title = catalog[0]
+        version = title.version
+        response = admin_client.patch(self.url(title), {
+            'name': title.name,
+            'year': title.year,
+            'genre': list(title.genre.values_list('slug', flat=True)),
+        })
+        assert response.status_code == 200
+        assert response['ETag'] == f'"{version}"'
+        title.refresh_from_db()
+        assert title.version == version, (
+            'Проверьте, что PATCH без изменений не меняет версию'
+        )
+
+    def test_concurrent_update_conflicts(self, catalog):
+        from api.exceptions import EditConflictError
+        from api.serializers import TitleSerializer
+
+        title = catalog[0]
+        type(title).objects.filter(pk=title.pk).update(version=title.version + 1)
+        serializer = TitleSerializer(
+            title, data={'name': 'Гонка'}, partial=True, context={}
+        )
+        serializer.is_valid(raise_exception=True)
+        with pytest.raises(EditConflictError):
+            serializer.save()
+
+    def test_weak_etag_from_compression_matches(self, admin_client, catalog,
+                                                settings):
+        settings.COMPRESSION_MIN_SIZE = 0
+        title = catalog[0]
+        response = admin_client.get(
+            self.url(title), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert response['Content-Encoding'] == 'gzip'
+        etag = response['ETag']
+        assert etag == f'W/"{title.version}"', (
+            'Проверьте, что сжатый ответ отдаёт слабый ETag'
+        )
+        response = admin_client.patch(
+            self.url(title), {'year': 1999}, HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что If-Match принимает слабый ETag сжатого ответа'
+        )
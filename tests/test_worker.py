@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+import pytest
+
+CALLS = []
+
+
+@pytest.fixture
+def register(monkeypatch):
+    from jobs import worker
+    from jobs.registry import REGISTRY, job
+
+    monkeypatch.setattr(worker.signal, 'signal', lambda *args: None)
+    CALLS.clear()
+    names = []
+
+    def register(func, **options):
+        names.append(f'tests.{func.__name__}')
+        return job(name=names[-1], **options)(func)
+
+    yield register
+    for name in names:
+        REGISTRY.pop(name, None)
+
+
+def record(*args):
+    CALLS.append(args)
+
+
+def explode():
+    CALLS.append(())
+    raise RuntimeError('boom')
+
+
+def run_burst():
+    from django.core.management import call_command
+
+    call_command('runworker', '--processes', '1', '--threads', '1', '--burst')
+
+
+def stored(job):
+    job.refresh_from_db()
+    return job
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWorker:
+
+    def test_burst_runs_jobs(self, register):
+        from jobs.models import Job
+
+        func = register(record)
+        jobs = [func.delay(number) for number in range(3)]
+        run_burst()
+        assert sorted(CALLS) == [(0,), (1,), (2,)]
+        assert {stored(job).status for job in jobs} == {Job.DONE}, (
+            'Проверьте, что обработчик в режиме --burst выполняет задачи '
+            'и завершается'
+        )
+        assert all(job.finished_at for job in jobs)
+
+    def test_retry_then_failure(self, register):
+        from django.utils import timezone
+        from jobs.models import Job
+
+        job = register(explode, max_attempts=2, backoff=60).delay()
+        run_burst()
+        job = stored(job)
+        assert (job.status, job.attempts) == (Job.QUEUED, 1), (
+            'Проверьте, что упавшая задача возвращается в очередь'
+        )
+        assert job.run_at >= timezone.now() + timedelta(seconds=50)
+        assert 'boom' in job.last_error
+        run_burst()
+        assert len(CALLS) == 1, (
+            'Проверьте, что повтор ждёт задержку перед запуском'
+        )
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_burst()
+        job = stored(job)
+        assert (job.status, job.attempts) == (Job.FAILED, 2), (
+            'Проверьте, что после max_attempts задача помечается failed'
+        )
+        assert job.finished_at is not None
+
+    def test_stale_heartbeat_requeued(self, register, settings):
+        from django.utils import timezone
+        from jobs.models import Job
+        from jobs.worker import requeue_stale
+
+        func = register(record)
+        stale_at = timezone.now() - timedelta(
+            seconds=settings.JOBS_HEARTBEAT_TIMEOUT + 1
+        )
+        running = dict(status=Job.RUNNING, worker='gone:1:0', attempts=1)
+        stale = func.delay('stale')
+        exhausted = func.delay('exhausted')
+        alive = func.delay('alive')
+        Job.objects.filter(pk=stale.pk).update(
+            heartbeat_at=stale_at, **running
+        )
+        Job.objects.filter(pk=exhausted.pk).update(
+            heartbeat_at=stale_at, max_attempts=1, **running
+        )
+        Job.objects.filter(pk=alive.pk).update(
+            heartbeat_at=timezone.now(), **running
+        )
+        requeue_stale()
+        assert stored(stale).status == Job.QUEUED, (
+            'Проверьте, что задача без сигнала обработчика '
+            'возвращается в очередь'
+        )
+        assert stored(exhausted).status == Job.FAILED
+        assert stored(alive).status == Job.RUNNING, (
+            'Проверьте, что задача живого обработчика не перезапускается'
+        )
+        run_burst()
+        assert CALLS == [('stale',)]
+        assert (stored(stale).status, stale.attempts) == (Job.DONE, 2)
+
+    def test_schedule_enqueues_once_per_period(self, register):
+        from django.utils import timezone
+        from jobs.models import Job, Schedule
+        from jobs.worker import run_schedules
+
+        func = register(record, every=timedelta(minutes=5))
+        run_schedules()
+        run_schedules()
+        assert Job.objects.filter(name=func.name).count() == 1, (
+            'Проверьте, что периодическая задача ставится раз за период'
+        )
+        schedule = Schedule.objects.get(name=func.name)
+        assert schedule.next_run_at > timezone.now() + timedelta(minutes=4)
+        Schedule.objects.filter(pk=schedule.pk).update(
+            next_run_at=timezone.now() - timedelta(seconds=1)
+        )
+        run_schedules()
+        run_schedules()
+        assert Job.objects.filter(name=func.name).count() == 2
+
+    def test_unrecorded_job_is_not_kept_alive(self, register, monkeypatch):
+        from django.db import DatabaseError
+        from jobs import worker
+        from jobs.models import Job
+
+        func = register(record)
+        lost, kept = func.delay('lost'), func.delay('kept')
+        execute = worker.execute
+
+        def flaky(job):
+            if job.pk == lost.pk:
+                raise DatabaseError('database is locked')
+            return execute(job)
+
+        monkeypatch.setattr(worker, 'execute', flaky)
+        runner = worker.Worker(1, burst=True)
+        runner.run()
+        assert stored(kept).status == Job.DONE, (
+            'Проверьте, что ошибка записи результата не останавливает поток'
+        )
+        assert stored(lost).status == Job.RUNNING
+        assert not runner.running
+        worker.heartbeat([kept.pk])
+        assert stored(lost).heartbeat_at == lost.started_at, (
+            'Проверьте, что сигнал обработчика продлевает только '
+            'выполняющиеся задачи'
+        )